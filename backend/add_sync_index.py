@@ -0,0 +1,38 @@
+"""Script para adicionar índice em reunioes.atualizado_em (sincronização incremental)."""
+import pymysql
+
+# Configurações do banco
+conn = pymysql.connect(
+    host='localhost',
+    user='root',
+    password='',
+    database='sistema_agendamento'
+)
+
+try:
+    with conn.cursor() as cursor:
+        # Verificar se o índice já existe
+        cursor.execute("""
+            SELECT INDEX_NAME 
+            FROM INFORMATION_SCHEMA.STATISTICS 
+            WHERE TABLE_SCHEMA = 'sistema_agendamento' 
+            AND TABLE_NAME = 'reunioes' 
+            AND INDEX_NAME = 'ix_reunioes_atualizado_em'
+        """)
+        
+        if cursor.fetchone() is None:
+            # Adicionar índice
+            cursor.execute("""
+                CREATE INDEX ix_reunioes_atualizado_em 
+                ON reunioes (atualizado_em)
+            """)
+            print("✅ Índice 'ix_reunioes_atualizado_em' adicionado com sucesso!")
+        else:
+            print("ℹ️ Índice 'ix_reunioes_atualizado_em' já existe.")
+        
+        conn.commit()
+        
+except Exception as e:
+    print(f"❌ Erro: {e}")
+finally:
+    conn.close()
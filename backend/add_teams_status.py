@@ -0,0 +1,43 @@
+"""Script para adicionar coluna teams_status na tabela reunioes."""
+import pymysql
+
+# Configurações do banco
+conn = pymysql.connect(
+    host='localhost',
+    user='root',
+    password='',
+    database='sistema_agendamento'
+)
+
+try:
+    with conn.cursor() as cursor:
+        # Verificar se a coluna já existe
+        cursor.execute("""
+            SELECT COLUMN_NAME 
+            FROM INFORMATION_SCHEMA.COLUMNS 
+            WHERE TABLE_SCHEMA = 'sistema_agendamento' 
+            AND TABLE_NAME = 'reunioes' 
+            AND COLUMN_NAME = 'teams_status'
+        """)
+        
+        if cursor.fetchone() is None:
+            # Adicionar coluna
+            cursor.execute("""
+                ALTER TABLE reunioes 
+                ADD COLUMN teams_status VARCHAR(20) NULL
+            """)
+            # Reuniões existentes: criado se já têm link, senão desativado
+            cursor.execute("""
+                UPDATE reunioes 
+                SET teams_status = IF(teams_link IS NULL, 'desativado', 'criado')
+            """)
+            print("✅ Coluna 'teams_status' adicionada com sucesso!")
+        else:
+            print("ℹ️ Coluna 'teams_status' já existe.")
+        
+        conn.commit()
+        
+except Exception as e:
+    print(f"❌ Erro: {e}")
+finally:
+    conn.close()
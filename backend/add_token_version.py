@@ -0,0 +1,38 @@
+"""Script para adicionar coluna token_version na tabela usuarios."""
+import pymysql
+
+# Configurações do banco
+conn = pymysql.connect(
+    host='localhost',
+    user='root',
+    password='',
+    database='sistema_agendamento'
+)
+
+try:
+    with conn.cursor() as cursor:
+        # Verificar se a coluna já existe
+        cursor.execute("""
+            SELECT COLUMN_NAME 
+            FROM INFORMATION_SCHEMA.COLUMNS 
+            WHERE TABLE_SCHEMA = 'sistema_agendamento' 
+            AND TABLE_NAME = 'usuarios' 
+            AND COLUMN_NAME = 'token_version'
+        """)
+        
+        if cursor.fetchone() is None:
+            # Adicionar coluna
+            cursor.execute("""
+                ALTER TABLE usuarios 
+                ADD COLUMN token_version INT NOT NULL DEFAULT 0
+            """)
+            print("✅ Coluna 'token_version' adicionada com sucesso!")
+        else:
+            print("ℹ️ Coluna 'token_version' já existe.")
+        
+        conn.commit()
+        
+except Exception as e:
+    print(f"❌ Erro: {e}")
+finally:
+    conn.close()
@@ -14,6 +14,32 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "sistema-agendamento-secret-key-2024"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    refresh_token_expire_days: int = 14
+    # Tokens usados/revogados ficam guardados por esse período (detecção de
+    # reuso) antes de serem removidos pela varredura periódica
+    refresh_token_retention_days: int = 7
+    refresh_token_sweep_seconds: float = 3600.0
+    
+    # Tokens de convite (RSVP) assinados com HMAC em vez de aleatórios no banco
+    rsvp_signed_tokens: bool = False
+    rsvp_token_secret: str = ""
+    rsvp_token_grace_hours: int = 24
+    
+    # Hash de senhas (bcrypt em pool de threads)
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 4
+    
+    # Tokens temporários (recuperação de senha): database | memory
+    token_store_backend: str = "database"
+    token_store_sweep_seconds: float = 300.0
+    # database: busca o usuário a cada requisição | claims: confia nas claims do JWT
+    auth_mode: str = "database"
+    token_revocation_refresh_seconds: float = 30.0
+    
+    # Cache de usuários autenticados (get_current_user)
+    user_cache_enabled: bool = True
+    user_cache_size: int = 1024
+    user_cache_ttl_seconds: float = 60.0
     
     # Frontend - URLs permitidas para CORS (separadas por vírgula)
     frontend_url: str = "http://localhost:5173"
@@ -26,12 +52,55 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     email_from: str = ""
     email_from_name: str = "Sistema de Agendamento"
+    smtp_starttls: bool = True
+    smtp_pool_size: int = 4
+    smtp_timeout: float = 30.0
+    smtp_keepalive_seconds: float = 60.0
     
     # Microsoft Azure / Teams
     azure_client_id: str = ""
     azure_tenant_id: str = ""
     azure_client_secret: str = ""
     azure_organizer_email: str = ""
+    azure_login_base: str = "https://login.microsoftonline.com"
+    graph_api_base: str = "https://graph.microsoft.com/v1.0"
+    graph_timeout: float = 30.0
+    graph_max_connections: int = 20
+    graph_max_keepalive_connections: int = 10
+    graph_keepalive_expiry: float = 60.0
+    graph_http2: bool = False
+    graph_batch_size: int = 20
+    graph_token_renew_ahead_seconds: float = 300.0
+    graph_token_retry_seconds: float = 30.0
+    teams_status_poll_seconds: float = 0.5
+    
+    # Outbox (e-mails e Teams processados fora da requisição)
+    outbox_workers: int = 2
+    outbox_batch_size: int = 20
+    outbox_poll_seconds: float = 2.0
+    outbox_lease_seconds: int = 300
+    outbox_max_attempts: int = 8
+    outbox_backoff_base_seconds: float = 5.0
+    outbox_backoff_max_seconds: float = 900.0
+    outbox_retention_days: int = 7
+    
+    # Atualizações do calendário em tempo real (SSE): memory
+    realtime_backend: str = "memory"
+    realtime_queue_size: int = 100
+    realtime_keepalive_seconds: float = 15.0
+    # Validade do ticket de uso único que abre o stream (EventSource)
+    realtime_ticket_seconds: int = 60
+    
+    # Sincronização incremental: segundos relidos após o último cursor
+    # (DATETIME sem fração + commits concorrentes)
+    sync_overlap_seconds: float = 2.0
+    
+    # Catálogo de salas em memória (conferência da versão no banco)
+    room_catalog_ttl_seconds: float = 60.0
+    
+    # Índice de ocupação em memória (verificação de disponibilidade)
+    occupancy_index_enabled: bool = False
+    occupancy_index_reconcile_seconds: int = 300
     
     @property
     def database_url(self) -> str:
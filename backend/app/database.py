@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, Enum, ForeignKey, func
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, Enum, ForeignKey, JSON, Index, func
 from datetime import datetime
 from typing import Optional, List
 from app.config import get_settings
@@ -39,6 +39,8 @@ class Usuario(Base):
     nome: Mapped[str] = mapped_column(String(255), nullable=False)
     senha_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     ativo: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    # Incrementada para revogar todos os tokens emitidos (ex.: redefinição de senha)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     criado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     atualizado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     
@@ -95,6 +97,10 @@ class RecursoSala(Base):
 # =====================
 class Reuniao(Base):
     __tablename__ = "reunioes"
+    __table_args__ = (
+        # Reuniões do organizador por período (GET /api/meetings)
+        Index("ix_reunioes_organizador_inicio", "organizador_id", "data_hora_inicio"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     titulo: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -106,8 +112,12 @@ class Reuniao(Base):
     status: Mapped[str] = mapped_column(String(20), default='agendada', index=True)
     teams_link: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     teams_event_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # pendente | criado | falhou | desativado | cancelado (evento criado em segundo plano pela outbox)
+    teams_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     criado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    atualizado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    # Indexado para a sincronização incremental (/api/meetings/changes); respostas
+    # de participantes também atualizam este campo
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), index=True)
     
     # Relacionamentos
     sala: Mapped["Sala"] = relationship("Sala", back_populates="reunioes")
@@ -138,6 +148,60 @@ class ParticipanteReuniao(Base):
     reuniao: Mapped["Reuniao"] = relationship("Reuniao", back_populates="participantes")
 
 
+# =====================
+# Modelo: OutboxJob
+# =====================
+class OutboxJob(Base):
+    """Efeito colateral (e-mail, Teams) gravado na mesma transação da reunião."""
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index("ix_outbox_status_disponivel", "status", "disponivel_em"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tipo: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default='pendente')
+    tentativas: Mapped[int] = mapped_column(Integer, default=0)
+    disponivel_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    ultimo_erro: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+
+# =====================
+# Modelo: RefreshToken
+# =====================
+class RefreshToken(Base):
+    """Refresh token (guardado como hash SHA-256). Tokens rotacionados a
+    partir do mesmo login compartilham a `familia`."""
+    __tablename__ = "refresh_tokens"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    usuario_id: Mapped[int] = mapped_column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), index=True)
+    familia: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    # token_version do usuário na emissão
+    versao: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expira_em: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    usado_em: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    revogado_em: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+# =====================
+# Modelo: TokenTemporario
+# =====================
+class TokenTemporario(Base):
+    """Token de uso único com validade (ex.: recuperação de senha), guardado como hash."""
+    __tablename__ = "tokens_temporarios"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    tipo: Mapped[str] = mapped_column(String(30), nullable=False)
+    dados: Mapped[dict] = mapped_column(JSON, nullable=False)
+    expira_em: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
 # =====================
 # Funções de Inicialização
 # =====================
@@ -152,6 +216,15 @@ async def init_db():
     
     # Criar salas padrão se não existirem
     await criar_salas_padrao()
+    
+    # Carregar catálogo de salas em memória
+    from app.services.room_catalog import room_catalog
+    await room_catalog.load()
+    
+    # Carregar índice de ocupação em memória
+    if settings.occupancy_index_enabled:
+        from app.services.occupancy_index import occupancy_index
+        await occupancy_index.start()
 
 
 async def criar_salas_padrao():
@@ -214,11 +287,17 @@ async def criar_salas_padrao():
                     session.add(recurso)
             
             await session.commit()
+            from app.services.room_catalog import room_catalog
+            room_catalog.bump()
             print("✅ Criadas 6 salas de reunião padrão")
 
 
 async def close_db():
     """Fechar conexão com o banco."""
+    if settings.occupancy_index_enabled:
+        from app.services.occupancy_index import occupancy_index
+        await occupancy_index.stop()
+    
     await engine.dispose()
     print("👋 Conexão MySQL fechada")
 
@@ -1,24 +1,62 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
 from app.database import init_db, close_db
-from app.routes import auth, rooms, meetings
+from app.routes import auth, rooms, meetings, metrics
+from app.services.email_service import email_service
+from app.services.graph_service import graph_service
+from app.services.outbox_service import outbox_worker
+from app.services.token_revocation import token_revocation
+from app.services.password_hasher import password_hasher
+from app.services.token_store import token_store
+from app.services.refresh_token_service import refresh_token_service
+from app.services.broadcaster import broadcaster
 
 settings = get_settings()
 
 
+class _SemQueryString(logging.Filter):
+    """Tirar a query string do access log do uvicorn (tickets, tokens de convite)."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple) and len(record.args) == 5:
+            cliente, metodo, caminho, versao, status = record.args
+            record.args = (cliente, metodo, str(caminho).split("?", 1)[0], versao, status)
+        return True
+
+
+logging.getLogger("uvicorn.access").addFilter(_SemQueryString())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown events."""
     # Startup
     print("🚀 Starting Meeting Scheduler API...")
     await init_db()
+    if settings.auth_mode == "claims":
+        await token_revocation.start()
+    await password_hasher.start()
+    await token_store.start()
+    await refresh_token_service.start()
+    await graph_service.start()
+    await outbox_worker.start()
+    await broadcaster.start()
     print("✅ API Ready!")
     
     yield
     
     # Shutdown
+    await broadcaster.stop()
+    await outbox_worker.stop()
+    await token_revocation.stop()
+    await token_store.stop()
+    await refresh_token_service.stop()
+    await graph_service.close()
+    await email_service.close()
+    password_hasher.close()
     await close_db()
     print("👋 Shutting down...")
 
@@ -38,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -45,6 +84,7 @@ app.include_router(auth.router)
 app.include_router(rooms.router)
 app.include_router(meetings.router)
 app.include_router(meetings.public_router)  # Rotas públicas de confirmação
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-import hashlib
 import secrets
-from datetime import datetime, timedelta
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 from app.database import get_db, Usuario
 from app.services.auth_service import auth_service
+from app.services.user_cache import user_cache
+from app.services.token_revocation import token_revocation
+from app.services.refresh_token_service import refresh_token_service
+from app.services.password_hasher import password_hasher
+from app.services.token_store import token_store
 from app.services.email_service import email_service
 from app.config import get_settings
 
@@ -16,8 +20,9 @@ settings = get_settings()
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-# Armazenamento temporário de tokens de recuperação (em produção, usar Redis ou banco)
-password_reset_tokens = {}
+# Tipos de token no token_store: recuperação de senha e ticket de stream (SSE)
+TOKEN_RESET_SENHA = "reset_senha"
+TOKEN_STREAM = "stream"
 
 
 # =====================
@@ -29,16 +34,6 @@ async def register_options():
     return {"message": "OK"}
 
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA256."""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify password against hash."""
-    return hash_password(password) == hashed
-
-
 # =====================
 # Schemas
 # =====================
@@ -65,9 +60,14 @@ class UserResponse(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
     user: UserResponse
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
 
@@ -77,6 +77,11 @@ class ResetPasswordRequest(BaseModel):
     new_password: str
 
 
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expires_in: int
+
+
 # =====================
 # Dependency para obter usuário atual
 # =====================
@@ -96,6 +101,28 @@ async def get_current_user(
     return usuario
 
 
+async def get_current_user_stream(
+    ticket: str = Query(...),
+    db: AsyncSession = Depends(get_db)
+) -> Usuario:
+    """Obter usuário atual em streams.
+    
+    O EventSource do navegador não envia cabeçalhos: em vez do access token
+    na URL, ele usa um ticket de uso único e curta duração (POST
+    /api/auth/stream-ticket), consumido aqui.
+    """
+    dados = await token_store.consume(TOKEN_STREAM, ticket)
+    usuario = await db.get(Usuario, dados["user_id"]) if dados else None
+    
+    if not usuario or usuario.ativo is False:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Ticket inválido ou expirado"
+        )
+    
+    return usuario
+
+
 # =====================
 # Endpoints
 # =====================
@@ -118,8 +145,8 @@ async def register(
                 detail="Email já cadastrado"
             )
         
-        # Criar hash da senha
-        senha_hash = hash_password(user_data.password)
+        # Criar hash da senha (bcrypt, fora do event loop)
+        senha_hash = await password_hasher.hash(user_data.password)
         
         # Criar usuário
         novo_usuario = Usuario(
@@ -129,14 +156,17 @@ async def register(
         )
         
         db.add(novo_usuario)
+        await db.flush()
+        
+        # Gerar tokens
+        refresh_token = refresh_token_service.issue(db, novo_usuario)
         await db.commit()
         await db.refresh(novo_usuario)
-        
-        # Gerar token
         token = auth_service.create_jwt_token(novo_usuario)
         
         return TokenResponse(
             access_token=token,
+            refresh_token=refresh_token,
             user=UserResponse(
                 id=novo_usuario.id,
                 email=novo_usuario.email,
@@ -165,7 +195,13 @@ async def login(
     )
     usuario = result.scalar_one_or_none()
     
-    if not usuario or not verify_password(login_data.password, usuario.senha_hash):
+    # E-mail desconhecido também passa pelo bcrypt (tempo de resposta igual)
+    if usuario:
+        senha_valida, novo_hash = await password_hasher.verify(login_data.password, usuario.senha_hash)
+    else:
+        senha_valida, novo_hash = await password_hasher.verify_dummy(login_data.password)
+    
+    if not senha_valida:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos"
@@ -177,11 +213,44 @@ async def login(
             detail="Usuário inativo"
         )
     
-    # Gerar token
+    # Regravar hash legado (SHA-256) ou com custo desatualizado
+    if novo_hash:
+        usuario.senha_hash = novo_hash
+    
+    # Gerar tokens
     token = auth_service.create_jwt_token(usuario)
+    refresh_token = refresh_token_service.issue(db, usuario)
+    await db.commit()
     
     return TokenResponse(
         access_token=token,
+        refresh_token=refresh_token,
+        user=UserResponse(
+            id=usuario.id,
+            email=usuario.email,
+            name=usuario.nome
+        )
+    )
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    request: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Renovar o access token com um refresh token (que é rotacionado)."""
+    resultado = await refresh_token_service.rotate(db, request.refresh_token)
+    
+    if not resultado:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido ou expirado"
+        )
+    
+    usuario, refresh_token = resultado
+    return TokenResponse(
+        access_token=auth_service.create_jwt_token(usuario),
+        refresh_token=refresh_token,
         user=UserResponse(
             id=usuario.id,
             email=usuario.email,
@@ -190,6 +259,16 @@ async def login(
     )
 
 
+@router.post("/logout")
+async def logout(
+    request: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Revogar o refresh token (e os demais da mesma sessão)."""
+    await refresh_token_service.revoke(db, request.refresh_token)
+    return {"message": "Sessão encerrada"}
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_me(
     current_user: Usuario = Depends(get_current_user)
@@ -202,6 +281,21 @@ async def get_me(
     )
 
 
+@router.post("/stream-ticket", response_model=StreamTicketResponse)
+async def create_stream_ticket(
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Emitir um ticket de uso único para abrir o stream do calendário."""
+    ticket = secrets.token_urlsafe(32)
+    await token_store.put(
+        TOKEN_STREAM,
+        ticket,
+        {"user_id": current_user.id},
+        ttl_seconds=settings.realtime_ticket_seconds
+    )
+    return StreamTicketResponse(ticket=ticket, expires_in=settings.realtime_ticket_seconds)
+
+
 @router.post("/forgot-password")
 async def forgot_password(
     request: ForgotPasswordRequest,
@@ -221,11 +315,12 @@ async def forgot_password(
         token = secrets.token_urlsafe(32)
         
         # Armazenar token com expiração de 1 hora
-        password_reset_tokens[token] = {
-            "user_id": usuario.id,
-            "email": usuario.email,
-            "expires_at": datetime.utcnow() + timedelta(hours=1)
-        }
+        await token_store.put(
+            TOKEN_RESET_SENHA,
+            token,
+            {"user_id": usuario.id, "email": usuario.email},
+            ttl_seconds=3600
+        )
         
         # URL de reset
         reset_url = f"{settings.frontend_url}/reset-password?token={token}"
@@ -247,8 +342,8 @@ async def reset_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Redefinir senha."""
-    # Verificar token
-    token_data = password_reset_tokens.get(request.token)
+    # Verificar token (expirados não são retornados; o token é de uso único)
+    token_data = await token_store.consume(TOKEN_RESET_SENHA, request.token)
     
     if not token_data:
         raise HTTPException(
@@ -256,14 +351,6 @@ async def reset_password(
             detail="Token inválido ou expirado"
         )
     
-    # Verificar expiração
-    if datetime.utcnow() > token_data["expires_at"]:
-        del password_reset_tokens[request.token]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Token inválido ou expirado"
-        )
-    
     # Buscar usuário
     result = await db.execute(
         select(Usuario).where(Usuario.id == token_data["user_id"])
@@ -276,12 +363,12 @@ async def reset_password(
             detail="Usuário não encontrado"
         )
     
-    # Atualizar senha
-    usuario.senha_hash = hash_password(request.new_password)
+    # Atualizar senha e revogar os tokens emitidos antes da redefinição
+    usuario.senha_hash = await password_hasher.hash(request.new_password)
+    usuario.token_version = (usuario.token_version or 0) + 1
     await db.commit()
-    
-    # Remover token usado
-    del password_reset_tokens[request.token]
+    user_cache.invalidate(usuario.id)
+    token_revocation.bump(usuario.id, usuario.token_version)
     
     return {"message": "Senha redefinida com sucesso!"}
 
@@ -1,24 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, func, and_, or_, case, literal, null, union_all
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import base64
+import binascii
+import html
+import json
 import secrets
-from app.database import get_db, Reuniao, Sala, RecursoSala, ParticipanteReuniao, Usuario
-from app.routes.auth import get_current_user
-from app.services.email_service import email_service
+import time
+from app.config import get_settings
+from app.database import get_db, Reuniao, ParticipanteReuniao, Usuario
+from app.routes.auth import get_current_user, get_current_user_stream
+from app.services.outbox_service import enqueue, outbox_worker, TIPO_TEAMS_CRIAR, TIPO_TEAMS_CANCELAR
+from app.services.availability_service import availability_service
+from app.services.occupancy_index import occupancy_index
 from app.services.graph_service import graph_service
+from app.services.rsvp_token import rsvp_tokens
+from app.services.etag import make_etag, etag_matches, not_modified, etag_headers
+from app.services.json_response import FastJSONResponse
+from app.services.room_catalog import room_catalog, SalaInfo
+from app.services.broadcaster import (
+    broadcaster, Subscription, EVENTO_CRIADA, EVENTO_CANCELADA, EVENTO_RESPOSTA, EVENTO_RESET
+)
 
-router = APIRouter(prefix="/api/meetings", tags=["meetings"])
+settings = get_settings()
 
-# Router público para confirmação de presença (sem autenticação)
-public_router = APIRouter(prefix="/api/meeting-confirmation", tags=["meeting-confirmation"])
+router = APIRouter(prefix="/api/meetings", tags=["meetings"], default_response_class=FastJSONResponse)
 
-# Armazenamento de tokens de confirmação (em produção usar Redis ou banco)
-meeting_confirmation_tokens = {}
+# Router público para confirmação de presença (sem autenticação)
+public_router = APIRouter(
+    prefix="/api/meeting-confirmation", tags=["meeting-confirmation"], default_response_class=FastJSONResponse
+)
 
 
 # =====================
@@ -60,6 +77,153 @@ class MeetingResponse(BaseModel):
     created_at: str
 
 
+# =====================
+# Páginas de confirmação (pré-renderizadas na importação)
+# =====================
+_MARCADOR_TITULO = "\x00titulo\x00"
+
+
+def _pagina_confirmacao(titulo_pagina: str, icone: str, cor_icone: str, titulo: str, mensagens: str) -> bytes:
+    """Montar uma página de resultado da confirmação de presença."""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{titulo_pagina}</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Arial, sans-serif; margin: 0; padding: 40px; background: linear-gradient(135deg, #f3b86b 0%, #fa993f 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }}
+        .card {{ background: white; border-radius: 16px; padding: 40px; max-width: 450px; text-align: center; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }}
+        .icon {{ width: 80px; height: 80px; background: {cor_icone}; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 20px; font-size: 40px; }}
+        h2 {{ margin: 0 0 10px; color: #333; }}
+        p {{ color: #666; margin: 10px 0; }}
+        .meeting {{ background: #f8f9fa; border-radius: 8px; padding: 15px; margin: 20px 0; }}
+        .close {{ color: #999; font-size: 13px; margin-top: 20px; }}
+    </style>
+</head>
+<body>
+    <div class="card">
+        <div class="icon">{icone}</div>
+        <h2>{titulo}</h2>
+        {mensagens}
+    </div>
+</body>
+</html>
+""".encode()
+
+
+def _pagina_com_titulo(titulo_pagina: str, icone: str, cor_icone: str, titulo: str, texto: str):
+    """Página com o título da reunião: retorna (prefixo, sufixo) em bytes."""
+    pagina = _pagina_confirmacao(titulo_pagina, icone, cor_icone, titulo, f"""<p>{texto}</p>
+        <div class="meeting"><strong>{_MARCADOR_TITULO}</strong></div>
+        <p>O organizador será notificado.</p>
+        <p class="close">Você pode fechar esta página.</p>""")
+    prefixo, sufixo = pagina.split(_MARCADOR_TITULO.encode())
+    return prefixo, sufixo
+
+
+_PAGINA_LINK_INVALIDO = _pagina_confirmacao(
+    "Link Inválido", "⚠️", "#fee2e2", "Link Inválido",
+    "<p>Este link já foi utilizado ou expirou.</p>"
+)
+_PAGINA_NAO_ENCONTRADO = _pagina_confirmacao(
+    "Erro", "❌", "#fee2e2", "Participante não encontrado",
+    "<p>Não foi possível processar sua resposta.</p>"
+)
+_PAGINA_ACEITO = _pagina_com_titulo(
+    "Presença Confirmada!", "✅", "#d1fae5", "Presença Confirmada!",
+    "Você confirmou presença na reunião:"
+)
+_PAGINA_RECUSADO = _pagina_com_titulo(
+    "Convite Recusado", "❌", "#fee2e2", "Convite Recusado",
+    "Você recusou o convite para a reunião:"
+)
+
+
+# =====================
+# Paginação por chave
+# =====================
+def _codificar_cursor(momento: datetime, reuniao_id: int) -> str:
+    """Cursor opaco para paginação por chave (momento, id)."""
+    bruto = f"{momento.isoformat()}|{reuniao_id}"
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def _decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        momento, reuniao_id = bruto.split("|")
+        return datetime.fromisoformat(momento), int(reuniao_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+# =====================
+# Listas (consultas só com as colunas usadas)
+# =====================
+# Colunas de GET /api/meetings e /invitations (dados da sala vêm do catálogo)
+_COLUNAS_LISTA = (
+    Reuniao.id,
+    Reuniao.titulo,
+    Reuniao.descricao,
+    Reuniao.sala_id,
+    Reuniao.organizador_id,
+    Reuniao.data_hora_inicio,
+    Reuniao.data_hora_fim,
+    Reuniao.status,
+    Reuniao.teams_link,
+    Reuniao.criado_em
+)
+
+
+async def _participantes_por_reuniao(db: AsyncSession, ids: List[int]) -> Dict[int, List[dict]]:
+    """Participantes de várias reuniões em uma única consulta de colunas."""
+    participantes: Dict[int, List[dict]] = {reuniao_id: [] for reuniao_id in ids}
+    if ids:
+        result = await db.execute(
+            select(
+                ParticipanteReuniao.reuniao_id,
+                ParticipanteReuniao.email,
+                ParticipanteReuniao.nome,
+                ParticipanteReuniao.status
+            )
+            .where(ParticipanteReuniao.reuniao_id.in_(ids))
+            .order_by(ParticipanteReuniao.id)
+        )
+        for row in result:
+            participantes[row.reuniao_id].append(
+                {"email": row.email, "name": row.nome, "status": row.status}
+            )
+    return participantes
+
+
+def _item_lista(
+    row,
+    sala: Optional[SalaInfo],
+    attendees: List[dict],
+    organizer_email: Optional[str],
+    organizer_name: Optional[str]
+) -> dict:
+    return {
+        "id": row.id,
+        "title": row.titulo,
+        "description": row.descricao,
+        "room_id": row.sala_id,
+        "room_name": sala.nome if sala else None,
+        "room_color": sala.cor if sala else None,
+        "organizer_id": row.organizador_id,
+        "organizer_email": organizer_email,
+        "organizer_name": organizer_name,
+        "attendees": attendees,
+        "start_datetime": row.data_hora_inicio,
+        "end_datetime": row.data_hora_fim,
+        "is_recurring": False,
+        "recurrence_pattern": None,
+        "status": row.status,
+        "teams_link": row.teams_link,
+        "created_at": row.criado_em
+    }
+
+
 # =====================
 # Endpoints
 # =====================
@@ -67,92 +231,360 @@ class MeetingResponse(BaseModel):
 async def get_meetings(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    after: Optional[str] = Query(None, description="Cursor da página anterior (cabeçalho X-Next-Cursor)"),
+    limit: int = Query(100, ge=1, le=500),
     current_user: Usuario = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Obter reuniões do usuário atual."""
-    query = select(Reuniao).options(
-        selectinload(Reuniao.sala),
-        selectinload(Reuniao.participantes)
-    ).where(
+    """Obter reuniões do usuário atual, em ordem de início.
+    
+    Paginação por chave (data_hora_inicio, id): quando houver mais reuniões,
+    o cabeçalho X-Next-Cursor traz o valor a enviar em `after`.
+    """
+    filtros = [
         Reuniao.organizador_id == current_user.id,
         Reuniao.status == 'agendada'
-    ).order_by(Reuniao.data_hora_inicio)
+    ]
+    if start_date:
+        filtros.append(Reuniao.data_hora_inicio >= datetime.fromisoformat(start_date.replace('Z', '+00:00')))
+    if end_date:
+        filtros.append(Reuniao.data_hora_inicio <= datetime.fromisoformat(end_date.replace('Z', '+00:00')))
+    if after:
+        inicio, reuniao_id = _decodificar_cursor(after)
+        filtros.append(or_(
+            Reuniao.data_hora_inicio > inicio,
+            and_(Reuniao.data_hora_inicio == inicio, Reuniao.id > reuniao_id)
+        ))
+    
+    # Índice (organizador_id, data_hora_inicio); id desempata horários iguais
+    query = (
+        select(*_COLUNAS_LISTA)
+        .where(*filtros)
+        .order_by(Reuniao.data_hora_inicio, Reuniao.id)
+        .limit(limit + 1)
+    )
     
     result = await db.execute(query)
-    reunioes = result.scalars().all()
+    linhas = result.all()
+    
+    headers = {}
+    if len(linhas) > limit:
+        linhas = linhas[:limit]
+        headers["X-Next-Cursor"] = _codificar_cursor(linhas[-1].data_hora_inicio, linhas[-1].id)
+    
+    participantes = await _participantes_por_reuniao(db, [row.id for row in linhas])
+    catalogo = await room_catalog.snapshot()
+    
+    return FastJSONResponse([
+        _item_lista(row, catalogo.get(row.sala_id), participantes[row.id], current_user.email, current_user.nome)
+        for row in linhas
+    ], headers=headers)
+
+
+# Filtro de resposta (API) -> status do participante no banco
+_STATUS_CONVITE = {"pending": "pendente", "accepted": "aceito", "declined": "recusado"}
+
+
+@router.get("/invitations")
+async def get_invitations(
+    status: Optional[str] = Query(None, description="pending | accepted | declined"),
+    include_organized: bool = Query(False, description="Incluir as reuniões organizadas pelo usuário"),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    after: Optional[str] = Query(None, description="Cursor da página anterior (cabeçalho X-Next-Cursor)"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Reuniões para as quais o usuário foi convidado (pelo e-mail).
+    
+    Com `include_organized`, as reuniões organizadas por ele entram na mesma
+    lista: as duas origens são combinadas em um único UNION ALL, cada ramo
+    limitado pelo próprio índice (participantes_reuniao.email e
+    organizador_id + data_hora_inicio). Paginação igual a GET /api/meetings.
+    """
+    if status is not None and status not in _STATUS_CONVITE:
+        raise HTTPException(status_code=400, detail="Status inválido")
+    
+    filtros = [Reuniao.status == 'agendada']
+    if start_date:
+        filtros.append(Reuniao.data_hora_inicio >= datetime.fromisoformat(start_date.replace('Z', '+00:00')))
+    if end_date:
+        filtros.append(Reuniao.data_hora_inicio <= datetime.fromisoformat(end_date.replace('Z', '+00:00')))
+    if after:
+        inicio, reuniao_id = _decodificar_cursor(after)
+        filtros.append(or_(
+            Reuniao.data_hora_inicio > inicio,
+            and_(Reuniao.data_hora_inicio == inicio, Reuniao.id > reuniao_id)
+        ))
+    
+    def ramo(query):
+        # Cada ramo já vem ordenado e limitado, usando o próprio índice
+        sub = query.where(*filtros).order_by(Reuniao.data_hora_inicio, Reuniao.id).limit(limit + 1).subquery()
+        return select(sub)
+    
+    convites = select(
+        Reuniao.id, Reuniao.data_hora_inicio,
+        literal("attendee").label("papel"), ParticipanteReuniao.status.label("meu_status")
+    ).join(ParticipanteReuniao, ParticipanteReuniao.reuniao_id == Reuniao.id).where(
+        ParticipanteReuniao.email == current_user.email,
+        # Organizador que se convidou aparece só como organizador
+        Reuniao.organizador_id != current_user.id
+    )
+    if status is not None:
+        convites = convites.where(ParticipanteReuniao.status == _STATUS_CONVITE[status])
+    ramos = [ramo(convites)]
+    
+    # Filtro de resposta só faz sentido para convites
+    if include_organized and status is None:
+        ramos.append(ramo(select(
+            Reuniao.id, Reuniao.data_hora_inicio,
+            literal("organizer").label("papel"), null().label("meu_status")
+        ).where(Reuniao.organizador_id == current_user.id)))
+    
+    pagina = union_all(*ramos).subquery()
+    result = await db.execute(
+        select(
+            *_COLUNAS_LISTA,
+            Usuario.email.label("organizador_email"),
+            Usuario.nome.label("organizador_nome"),
+            pagina.c.papel,
+            pagina.c.meu_status
+        )
+        .join(pagina, pagina.c.id == Reuniao.id)
+        .outerjoin(Usuario, Usuario.id == Reuniao.organizador_id)
+        .order_by(pagina.c.data_hora_inicio, pagina.c.id)
+        .limit(limit + 1)
+    )
+    linhas = result.all()
+    
+    headers = {}
+    if len(linhas) > limit:
+        linhas = linhas[:limit]
+        headers["X-Next-Cursor"] = _codificar_cursor(linhas[-1].data_hora_inicio, linhas[-1].id)
     
-    return [
+    participantes = await _participantes_por_reuniao(db, [row.id for row in linhas])
+    catalogo = await room_catalog.snapshot()
+    
+    return FastJSONResponse([
         {
-            "id": r.id,
-            "title": r.titulo,
-            "description": r.descricao,
-            "room_id": r.sala_id,
-            "room_name": r.sala.nome if r.sala else None,
-            "room_color": r.sala.cor if r.sala else None,
-            "organizer_id": r.organizador_id,
-            "organizer_email": current_user.email,
-            "organizer_name": current_user.nome,
-            "attendees": [
-                {"email": p.email, "name": p.nome, "status": p.status}
-                for p in r.participantes
-            ],
-            "start_datetime": r.data_hora_inicio.isoformat(),
-            "end_datetime": r.data_hora_fim.isoformat(),
-            "is_recurring": False,
-            "recurrence_pattern": None,
-            "status": r.status,
-            "teams_link": r.teams_link,
-            "created_at": r.criado_em.isoformat()
+            **_item_lista(
+                row, catalogo.get(row.sala_id), participantes[row.id],
+                row.organizador_email, row.organizador_nome
+            ),
+            "role": row.papel,
+            "my_status": row.meu_status
         }
-        for r in reunioes
-    ]
+        for row in linhas
+    ], headers=headers)
 
 
 @router.get("/calendar")
 async def get_calendar_events(
+    request: Request,
     start: str = Query(...),
     end: str = Query(...),
     current_user: Usuario = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Obter eventos do calendário (todas as reuniões)."""
+    """Obter eventos do calendário (todas as reuniões).
+    
+    Responde 304 quando o If-None-Match confere com a versão atual do período.
+    """
     start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')) if 'Z' in start else datetime.fromisoformat(start)
     end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')) if 'Z' in end else datetime.fromisoformat(end)
     
+    # Versão do período: contagens + última alteração das reuniões, mais a
+    # versão do catálogo de salas. As contagens cobrem alterações no mesmo
+    # segundo (DATETIME sem fração).
+    catalogo = await room_catalog.snapshot()
+    janela = and_(Reuniao.data_hora_inicio >= start_dt, Reuniao.data_hora_inicio <= end_dt)
+    versao = (await db.execute(
+        select(
+            func.count(Reuniao.id),
+            func.count(case((Reuniao.status == 'agendada', Reuniao.id))),
+            func.count(Reuniao.teams_link),
+            func.max(Reuniao.atualizado_em)
+        ).where(janela)
+    )).one()
+    etag = make_etag(
+        "calendar", current_user.id, start_dt.isoformat(), end_dt.isoformat(), catalogo.versao, *versao
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Uma consulta só com as colunas da resposta (sem entidades ORM)
     result = await db.execute(
-        select(Reuniao).options(
-            selectinload(Reuniao.sala),
-            selectinload(Reuniao.organizador)
-        ).where(
-            Reuniao.status == 'agendada',
-            Reuniao.data_hora_inicio >= start_dt,
-            Reuniao.data_hora_inicio <= end_dt
-        ).order_by(Reuniao.data_hora_inicio)
+        select(
+            Reuniao.id,
+            Reuniao.titulo,
+            Reuniao.data_hora_inicio,
+            Reuniao.data_hora_fim,
+            Reuniao.sala_id,
+            Reuniao.organizador_id,
+            Reuniao.teams_link,
+            Usuario.nome.label("organizador_nome")
+        )
+        .outerjoin(Usuario, Usuario.id == Reuniao.organizador_id)
+        .where(janela, Reuniao.status == 'agendada')
+        .order_by(Reuniao.data_hora_inicio)
     )
-    reunioes = result.scalars().all()
+    usuario_id = current_user.id
+    salas = catalogo.por_id
     
-    return [
+    return FastJSONResponse([
         {
-            "id": r.id,
-            "title": r.titulo,
-            "start": r.data_hora_inicio.isoformat(),
-            "end": r.data_hora_fim.isoformat(),
-            "room_id": r.sala_id,
-            "room_name": r.sala.nome if r.sala else "Sala",
-            "room_color": r.sala.cor if r.sala else "#6366F1",
-            "organizer_name": r.organizador.nome if r.organizador else "Organizador",
-            "is_own_meeting": r.organizador_id == current_user.id,
-            "teams_link": r.teams_link
+            "id": row.id,
+            "title": row.titulo,
+            "start": row.data_hora_inicio,
+            "end": row.data_hora_fim,
+            "room_id": row.sala_id,
+            "room_name": sala.nome if sala else "Sala",
+            "room_color": sala.cor if sala else "#6366F1",
+            "organizer_name": row.organizador_nome or "Organizador",
+            "is_own_meeting": row.organizador_id == usuario_id,
+            "teams_link": row.teams_link
         }
-        for r in reunioes
-    ]
+        for row in result
+        for sala in (salas.get(row.sala_id),)
+    ], headers=etag_headers(etag))
+
+
+@router.get("/stream")
+async def stream_calendar_events(
+    start: Optional[str] = Query(None),
+    end: Optional[str] = Query(None),
+    rooms: Optional[str] = Query(None, description="IDs de salas separados por vírgula"),
+    current_user: Usuario = Depends(get_current_user_stream),
+    db: AsyncSession = Depends(get_db)
+):
+    """Atualizações do calendário em tempo real (Server-Sent Events).
+    
+    Envia `meeting.created`, `meeting.cancelled` e `meeting.rsvp` das reuniões
+    que começam no período e nas salas pedidos. `reset` indica que eventos
+    foram perdidos e o cliente deve recarregar o calendário. Autenticado por
+    `?ticket=` de uso único (POST /api/auth/stream-ticket).
+    """
+    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')) if start else None
+    end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')) if end else None
+    try:
+        salas = [int(s) for s in rooms.split(",") if s.strip()] if rooms else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Parâmetro rooms inválido")
+    
+    # A sessão só foi usada na autenticação; não segurar a conexão durante o stream
+    await db.close()
+    
+    usuario_id = current_user.id
+    sub = broadcaster.subscribe(Subscription(usuario_id, start_dt, end_dt, salas))
+    
+    async def eventos():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    tipo, dados = await asyncio.wait_for(
+                        sub.fila.get(), settings.realtime_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                
+                if tipo == EVENTO_CRIADA:
+                    dados = {**dados, "is_own_meeting": dados["organizer_id"] == usuario_id}
+                yield f"event: {tipo}\ndata: {json.dumps(dados)}\n\n"
+                if tipo == EVENTO_RESET:
+                    break
+        finally:
+            broadcaster.unsubscribe(sub)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _alteracao(r: Reuniao, sala: Optional[SalaInfo], usuario_id: int) -> dict:
+    """Reunião no formato da sincronização; canceladas viram lápides."""
+    if r.status == 'cancelada':
+        return {"id": r.id, "deleted": True, "updated_at": r.atualizado_em}
+    return {
+        "id": r.id,
+        "deleted": False,
+        "title": r.titulo,
+        "description": r.descricao,
+        "start": r.data_hora_inicio,
+        "end": r.data_hora_fim,
+        "room_id": r.sala_id,
+        "room_name": sala.nome if sala else "Sala",
+        "room_color": sala.cor if sala else "#6366F1",
+        "organizer_name": r.organizador.nome if r.organizador else "Organizador",
+        "is_own_meeting": r.organizador_id == usuario_id,
+        "attendees": [
+            {"email": p.email, "name": p.nome, "status": p.status}
+            for p in r.participantes
+        ],
+        "teams_link": r.teams_link,
+        "teams_status": r.teams_status,
+        "updated_at": r.atualizado_em
+    }
+
+
+@router.get("/changes")
+async def get_meeting_changes(
+    since: Optional[str] = Query(None, description="Cursor devolvido pela sincronização anterior"),
+    limit: int = Query(200, ge=1, le=1000),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Reuniões criadas, alteradas ou canceladas desde o cursor.
+    
+    Sem `since` devolve tudo (sincronização inicial). Enquanto `has_more`
+    for verdadeiro, chamar de novo com o `cursor` recebido. O cliente aplica
+    os itens por id: os últimos `sync_overlap_seconds` são relidos na
+    sincronização seguinte, então um item pode vir repetido.
+    """
+    query = select(Reuniao).options(
+        selectinload(Reuniao.organizador),
+        selectinload(Reuniao.participantes)
+    ).order_by(Reuniao.atualizado_em, Reuniao.id).limit(limit + 1)
+    
+    anterior = None
+    if since:
+        anterior = _decodificar_cursor(since)
+        query = query.where(or_(
+            Reuniao.atualizado_em > anterior[0],
+            and_(Reuniao.atualizado_em == anterior[0], Reuniao.id > anterior[1])
+        ))
+    
+    result = await db.execute(query)
+    reunioes = result.scalars().all()
+    catalogo = await room_catalog.snapshot()
+    has_more = len(reunioes) > limit
+    reunioes = reunioes[:limit]
+    ultimo = (reunioes[-1].atualizado_em, reunioes[-1].id) if reunioes else anterior
+    
+    if has_more:
+        proximo = ultimo
+    else:
+        # Em dia: o próximo cursor recua até `agora - overlap` para não perder
+        # commits ainda em andamento com atualizado_em no mesmo segundo. Toda
+        # escrita em reuniões grava atualizado_em com este mesmo relógio (o da
+        # aplicação); o onupdate do banco fica só para escritas externas.
+        limite = (datetime.now() - timedelta(seconds=settings.sync_overlap_seconds), 0)
+        proximo = min(ultimo, limite) if ultimo else limite
+    
+    return FastJSONResponse({
+        "changes": [_alteracao(r, catalogo.get(r.sala_id), current_user.id) for r in reunioes],
+        "cursor": _codificar_cursor(*proximo),
+        "has_more": has_more
+    })
 
 
 @router.post("/", status_code=201)
 async def create_meeting(
     meeting_data: MeetingCreate,
-    background_tasks: BackgroundTasks,
     current_user: Usuario = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -161,52 +593,20 @@ async def create_meeting(
     start_dt = datetime.fromisoformat(meeting_data.start_datetime)
     end_dt = datetime.fromisoformat(meeting_data.end_datetime)
     
-    # Buscar sala
-    result = await db.execute(
-        select(Sala).options(selectinload(Sala.recursos)).where(Sala.id == meeting_data.room_id)
-    )
-    sala = result.scalar_one_or_none()
+    # Buscar sala (catálogo em memória)
+    sala = (await room_catalog.snapshot()).get(meeting_data.room_id)
     
     if not sala:
         raise HTTPException(status_code=404, detail="Sala não encontrada")
     
     # Verificar conflitos
-    conflict_result = await db.execute(
-        select(Reuniao).where(
-            Reuniao.sala_id == meeting_data.room_id,
-            Reuniao.status == 'agendada',
-            Reuniao.data_hora_inicio < end_dt,
-            Reuniao.data_hora_fim > start_dt
-        )
-    )
-    conflict = conflict_result.scalar_one_or_none()
+    conflict = await availability_service.find_conflict(db, meeting_data.room_id, start_dt, end_dt)
     
     if conflict:
         # Buscar salas disponíveis
-        all_rooms_result = await db.execute(
-            select(Sala).options(selectinload(Sala.recursos)).where(Sala.ativa == True)
+        available_rooms = await availability_service.get_available_rooms(
+            db, start_dt, end_dt, exclude_room_id=meeting_data.room_id
         )
-        all_rooms = all_rooms_result.scalars().all()
-        
-        available_rooms = []
-        for r in all_rooms:
-            if r.id == meeting_data.room_id:
-                continue
-            room_conflict = await db.execute(
-                select(Reuniao).where(
-                    Reuniao.sala_id == r.id,
-                    Reuniao.status == 'agendada',
-                    Reuniao.data_hora_inicio < end_dt,
-                    Reuniao.data_hora_fim > start_dt
-                )
-            )
-            if room_conflict.scalar_one_or_none() is None:
-                available_rooms.append({
-                    "id": r.id,
-                    "name": r.nome,
-                    "capacity": r.capacidade,
-                    "color": r.cor
-                })
         
         raise HTTPException(
             status_code=409,
@@ -221,7 +621,8 @@ async def create_meeting(
             }
         )
     
-    # Criar reunião
+    # Criar reunião (timestamps definidos aqui para dispensar o refresh após o commit)
+    agora = datetime.now()
     reuniao = Reuniao(
         titulo=meeting_data.title,
         descricao=meeting_data.description,
@@ -229,71 +630,80 @@ async def create_meeting(
         organizador_id=current_user.id,
         data_hora_inicio=start_dt,
         data_hora_fim=end_dt,
-        status='agendada'
+        status='agendada',
+        teams_status='pendente' if graph_service.is_configured else 'desativado',
+        criado_em=agora,
+        atualizado_em=agora
     )
     db.add(reuniao)
     await db.flush()
     
-    # Adicionar participantes com token de confirmação
-    tokens_participantes = []
-    for att in meeting_data.attendees:
-        confirmation_token = secrets.token_urlsafe(32)
-        participante = ParticipanteReuniao(
+    # Adicionar participantes com token de confirmação (aleatório no banco ou
+    # assinado, derivado do id do participante)
+    participantes = [
+        ParticipanteReuniao(
             reuniao_id=reuniao.id,
             email=att.email,
             nome=att.name,
             status='pendente',
-            confirmation_token=confirmation_token
+            confirmation_token=None if settings.rsvp_signed_tokens else secrets.token_urlsafe(32)
         )
-        db.add(participante)
-        tokens_participantes.append({
-            "email": att.email,
-            "name": att.name,
-            "token": confirmation_token
-        })
+        for att in meeting_data.attendees
+    ]
+    db.add_all(participantes)
     
-    await db.commit()
-    await db.refresh(reuniao)
+    # Tokens assinados valem até o fim da reunião + tolerância e precisam do id
+    expira_em = end_dt + timedelta(hours=settings.rsvp_token_grace_hours)
+    if settings.rsvp_signed_tokens and participantes:
+        await db.flush()
     
-    # Criar evento de calendário no Microsoft Teams/Outlook
-    teams_link = None
-    try:
-        attendee_emails = [att.email for att in meeting_data.attendees]
-        # Usar create_calendar_event para garantir notificações e presença na agenda
-        teams_result = await graph_service.create_calendar_event(
-            subject=meeting_data.title,
-            start=start_dt,
-            end=end_dt,
-            attendees=attendee_emails,
-            description=meeting_data.description
-        )
-        if teams_result:
-            teams_link = teams_result["join_url"]
-            reuniao.teams_link = teams_link
-            reuniao.teams_event_id = teams_result["event_id"]
-            await db.commit()
-            await db.refresh(reuniao)
-    except Exception as e:
-        print(f"⚠️ Erro ao criar evento no Teams (reunião local criada): {e}")
-    
-    # Enviar e-mails para os participantes em background
-    for att_info in tokens_participantes:
-        background_tasks.add_task(
-            email_service.send_meeting_invitation,
-            to_email=att_info["email"],
-            participant_name=att_info["name"],
-            meeting_title=meeting_data.title,
-            meeting_id=reuniao.id,
-            meeting_date=start_dt,
-            meeting_start=start_dt.strftime("%H:%M"),
-            meeting_end=end_dt.strftime("%H:%M"),
-            room_name=sala.nome,
-            organizer_name=current_user.nome,
-            organizer_email=current_user.email,
-            confirmation_token=att_info["token"],
-            description=meeting_data.description,
-            teams_link=teams_link
-        )
+    tokens_participantes = [
+        {
+            "email": p.email,
+            "name": p.nome,
+            "token": rsvp_tokens.sign(p.id, expira_em) if settings.rsvp_signed_tokens else p.confirmation_token
+        }
+        for p in participantes
+    ]
+    
+    # Evento no Teams e convites por e-mail são processados pela outbox,
+    # gravados na mesma transação da reunião
+    enqueue(db, TIPO_TEAMS_CRIAR, {
+        "meeting_id": reuniao.id,
+        "subject": meeting_data.title,
+        "start": start_dt.isoformat(),
+        "end": end_dt.isoformat(),
+        "attendees": [att.email for att in meeting_data.attendees],
+        "description": meeting_data.description,
+        "invitations": {
+            "attendees": tokens_participantes,
+            "meeting_title": meeting_data.title,
+            "meeting_id": reuniao.id,
+            "meeting_date": start_dt.isoformat(),
+            "meeting_start": start_dt.strftime("%H:%M"),
+            "meeting_end": end_dt.strftime("%H:%M"),
+            "room_name": sala.nome,
+            "organizer_name": current_user.nome,
+            "organizer_email": current_user.email,
+            "description": meeting_data.description
+        }
+    })
+    
+    await db.commit()
+    occupancy_index.add(reuniao.sala_id, reuniao.id, start_dt, end_dt)
+    outbox_worker.notify()
+    await broadcaster.publish(EVENTO_CRIADA, reuniao.sala_id, start_dt, {
+        "id": reuniao.id,
+        "title": reuniao.titulo,
+        "start": start_dt.isoformat(),
+        "end": end_dt.isoformat(),
+        "room_id": reuniao.sala_id,
+        "room_name": sala.nome,
+        "room_color": sala.cor,
+        "organizer_id": current_user.id,
+        "organizer_name": current_user.nome,
+        "teams_link": None
+    })
     
     return {
         "id": reuniao.id,
@@ -312,6 +722,7 @@ async def create_meeting(
         "recurrence_pattern": None,
         "status": reuniao.status,
         "teams_link": reuniao.teams_link,
+        "teams_status": reuniao.teams_status,
         "created_at": reuniao.criado_em.isoformat()
     }
 
@@ -329,20 +740,22 @@ async def check_availability(
     start_dt = datetime.fromisoformat(start)
     end_dt = datetime.fromisoformat(end)
     
+    # Responder pelo índice em memória quando a sala estiver livre; em caso de
+    # conflito, o banco confirma e fornece os detalhes
+    if occupancy_index.pode_responder(start_dt):
+        if occupancy_index.find_conflict(room_id, start_dt, end_dt, meeting_id) is None:
+            return {
+                "is_available": True,
+                "room_id": room_id,
+                "start": start,
+                "end": end
+            }
+    
     # Verificar conflitos
-    query = select(Reuniao).where(
-        Reuniao.sala_id == room_id,
-        Reuniao.status == 'agendada',
-        Reuniao.data_hora_inicio < end_dt,
-        Reuniao.data_hora_fim > start_dt
+    conflict = await availability_service.find_conflict(
+        db, room_id, start_dt, end_dt, exclude_meeting_id=meeting_id
     )
     
-    if meeting_id:
-        query = query.where(Reuniao.id != meeting_id)
-    
-    result = await db.execute(query)
-    conflict = result.scalar_one_or_none()
-    
     response = {
         "is_available": conflict is None,
         "room_id": room_id,
@@ -351,36 +764,13 @@ async def check_availability(
     }
     
     if conflict:
-        # Buscar sala
-        sala_result = await db.execute(select(Sala).where(Sala.id == room_id))
-        sala = sala_result.scalar_one_or_none()
+        # Buscar sala (catálogo em memória)
+        sala = (await room_catalog.snapshot()).get(room_id)
         
         # Buscar salas disponíveis
-        all_rooms_result = await db.execute(
-            select(Sala).options(selectinload(Sala.recursos)).where(Sala.ativa == True)
+        available_rooms = await availability_service.get_available_rooms(
+            db, start_dt, end_dt, exclude_room_id=room_id, exclude_meeting_id=meeting_id
         )
-        all_rooms = all_rooms_result.scalars().all()
-        
-        available_rooms = []
-        for r in all_rooms:
-            if r.id == room_id:
-                continue
-            room_conflict = await db.execute(
-                select(Reuniao).where(
-                    Reuniao.sala_id == r.id,
-                    Reuniao.status == 'agendada',
-                    Reuniao.data_hora_inicio < end_dt,
-                    Reuniao.data_hora_fim > start_dt
-                )
-            )
-            if room_conflict.scalar_one_or_none() is None:
-                available_rooms.append({
-                    "id": r.id,
-                    "name": r.nome,
-                    "capacity": r.capacidade,
-                    "color": r.cor,
-                    "resources": [rec.nome_recurso for rec in r.recursos]
-                })
         
         response["conflict"] = {
             "message": f"A sala '{sala.nome if sala else 'selecionada'}' já está reservada neste horário.",
@@ -395,6 +785,173 @@ async def check_availability(
     return response
 
 
+async def _buscar_agenda_do_dia(
+    db: AsyncSession,
+    dia: str,
+    room_id: Optional[int] = None
+) -> List[dict]:
+    """Agenda do dia de todas as salas ativas (ou de uma sala) em uma única consulta."""
+    try:
+        inicio_dia = datetime.fromisoformat(dia[:10])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Data inválida")
+    fim_dia = inicio_dia + timedelta(days=1)
+    
+    # Salas (e sua ordem) vêm do catálogo; o banco só é consultado pelas reuniões
+    catalogo = await room_catalog.snapshot()
+    if room_id is not None:
+        sala = catalogo.get(room_id)
+        salas = (sala,) if sala else ()
+    else:
+        salas = catalogo.ativas
+    if not salas:
+        return []
+    
+    agenda = {
+        sala.id: {
+            "room_id": sala.id,
+            "room_name": sala.nome,
+            "room_color": sala.cor,
+            "date": inicio_dia.date(),
+            "meetings": []
+        }
+        for sala in salas
+    }
+    
+    result = await db.execute(
+        select(
+            Reuniao.id,
+            Reuniao.sala_id,
+            Reuniao.titulo,
+            Reuniao.data_hora_inicio,
+            Reuniao.data_hora_fim,
+            Usuario.nome.label("organizador_nome")
+        )
+        .outerjoin(Usuario, Usuario.id == Reuniao.organizador_id)
+        .where(
+            Reuniao.sala_id.in_(list(agenda)),
+            Reuniao.status == 'agendada',
+            Reuniao.data_hora_inicio < fim_dia,
+            Reuniao.data_hora_fim > inicio_dia
+        )
+        .order_by(Reuniao.data_hora_inicio)
+    )
+    
+    for row in result:
+        agenda[row.sala_id]["meetings"].append({
+            "id": row.id,
+            "title": row.titulo,
+            "start": row.data_hora_inicio,
+            "end": row.data_hora_fim,
+            "organizer_name": row.organizador_nome
+        })
+    
+    return list(agenda.values())
+
+
+@router.get("/schedule")
+async def get_rooms_schedule(
+    date: str = Query(...),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Obter a agenda do dia de todas as salas ativas."""
+    return FastJSONResponse({
+        "date": date[:10],
+        "rooms": await _buscar_agenda_do_dia(db, date)
+    })
+
+
+@router.get("/room/{room_id}/schedule")
+async def get_room_schedule(
+    room_id: int,
+    date: str = Query(...),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Obter a agenda do dia de uma sala."""
+    agenda = await _buscar_agenda_do_dia(db, date, room_id)
+    
+    if not agenda:
+        raise HTTPException(status_code=404, detail="Sala não encontrada")
+    
+    return FastJSONResponse(agenda[0])
+
+
+def _filtro_token_convite(token: str):
+    """Condição que localiza o participante pelo token do convite.
+    
+    Token assinado: chave primária, e só enquanto o participante estiver
+    pendente (uso único). Token aleatório: coluna confirmation_token.
+    """
+    participante_id = rsvp_tokens.verify(token)
+    if participante_id is not None:
+        return and_(
+            ParticipanteReuniao.id == participante_id,
+            ParticipanteReuniao.status == 'pendente'
+        )
+    return ParticipanteReuniao.confirmation_token == token
+
+
+@router.get("/confirm", response_class=HTMLResponse)
+async def confirm_meeting_attendance(
+    token: str,
+    response: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Confirmar presença via link do e-mail - retorna HTML diretamente.
+    
+    Mesma semântica de /api/meeting-confirmation/respond: o token é de uso
+    único e qualquer resposta diferente de "accept" recusa o convite.
+    """
+    # Uma consulta: participante pelo token (índice único ou chave primária)
+    # + título da reunião
+    filtro = _filtro_token_convite(token)
+    result = await db.execute(
+        select(
+            ParticipanteReuniao.id,
+            ParticipanteReuniao.email,
+            Reuniao.id.label("reuniao_id"),
+            Reuniao.titulo,
+            Reuniao.sala_id,
+            Reuniao.data_hora_inicio
+        )
+        .outerjoin(Reuniao, Reuniao.id == ParticipanteReuniao.reuniao_id)
+        .where(filtro)
+    )
+    row = result.first()
+    
+    if not row:
+        return HTMLResponse(content=_PAGINA_LINK_INVALIDO, status_code=400)
+    if row.titulo is None:
+        return HTMLResponse(content=_PAGINA_NAO_ENCONTRADO, status_code=404)
+    
+    # Atualizar status e limpar o token; repetir o filtro evita uso duplo
+    is_accepted = response == "accept"
+    novo_status = "aceito" if is_accepted else "recusado"
+    atualizado = await db.execute(
+        update(ParticipanteReuniao)
+        .where(ParticipanteReuniao.id == row.id, filtro)
+        .values(status=novo_status, confirmation_token=None)
+    )
+    
+    if atualizado.rowcount != 1:
+        return HTMLResponse(content=_PAGINA_LINK_INVALIDO, status_code=400)
+    
+    # Marcar a reunião como alterada (sincronização incremental)
+    await db.execute(
+        update(Reuniao).where(Reuniao.id == row.reuniao_id).values(atualizado_em=datetime.now())
+    )
+    await db.commit()
+    
+    await broadcaster.publish(EVENTO_RESPOSTA, row.sala_id, row.data_hora_inicio, {
+        "id": row.reuniao_id, "email": row.email, "status": novo_status
+    })
+    
+    prefixo, sufixo = _PAGINA_ACEITO if is_accepted else _PAGINA_RECUSADO
+    return HTMLResponse(content=prefixo + html.escape(row.titulo).encode() + sufixo)
+
+
 @router.get("/{meeting_id}")
 async def get_meeting(
     meeting_id: int,
@@ -404,7 +961,6 @@ async def get_meeting(
     """Obter reunião específica."""
     result = await db.execute(
         select(Reuniao).options(
-            selectinload(Reuniao.sala),
             selectinload(Reuniao.participantes),
             selectinload(Reuniao.organizador)
         ).where(Reuniao.id == meeting_id)
@@ -414,13 +970,15 @@ async def get_meeting(
     if not reuniao:
         raise HTTPException(status_code=404, detail="Reunião não encontrada")
     
-    return {
+    sala = (await room_catalog.snapshot()).get(reuniao.sala_id)
+    
+    return FastJSONResponse({
         "id": reuniao.id,
         "title": reuniao.titulo,
         "description": reuniao.descricao,
         "room_id": reuniao.sala_id,
-        "room_name": reuniao.sala.nome if reuniao.sala else None,
-        "room_color": reuniao.sala.cor if reuniao.sala else None,
+        "room_name": sala.nome if sala else None,
+        "room_color": sala.cor if sala else None,
         "organizer_id": reuniao.organizador_id,
         "organizer_email": reuniao.organizador.email if reuniao.organizador else None,
         "organizer_name": reuniao.organizador.nome if reuniao.organizador else None,
@@ -428,13 +986,50 @@ async def get_meeting(
             {"email": p.email, "name": p.nome, "status": p.status}
             for p in reuniao.participantes
         ],
-        "start_datetime": reuniao.data_hora_inicio.isoformat(),
-        "end_datetime": reuniao.data_hora_fim.isoformat(),
+        "start_datetime": reuniao.data_hora_inicio,
+        "end_datetime": reuniao.data_hora_fim,
         "is_recurring": False,
         "recurrence_pattern": None,
         "status": reuniao.status,
         "teams_link": reuniao.teams_link,
-        "created_at": reuniao.criado_em.isoformat()
+        "teams_status": reuniao.teams_status,
+        "created_at": reuniao.criado_em
+    })
+
+
+@router.get("/{meeting_id}/teams")
+async def get_meeting_teams_status(
+    meeting_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Segundos de espera enquanto o status for 'pendente'"),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Status do evento no Teams (criado em segundo plano).
+    
+    Com `wait` > 0 funciona como long-polling: responde assim que o status
+    deixar de ser 'pendente', a reunião for cancelada ou o tempo acabar.
+    """
+    limite = time.monotonic() + wait
+    while True:
+        result = await db.execute(
+            select(Reuniao.status, Reuniao.teams_status, Reuniao.teams_link).where(Reuniao.id == meeting_id)
+        )
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Reunião não encontrada")
+        
+        restante = limite - time.monotonic()
+        if row.teams_status != 'pendente' or row.status != 'agendada' or restante <= 0:
+            break
+        
+        # Encerrar a transação para enxergar o commit feito pela outbox
+        await db.rollback()
+        await asyncio.sleep(min(settings.teams_status_poll_seconds, restante))
+    
+    return {
+        "meeting_id": meeting_id,
+        "teams_status": row.teams_status,
+        "teams_link": row.teams_link
     }
 
 
@@ -445,8 +1040,10 @@ async def cancel_meeting(
     db: AsyncSession = Depends(get_db)
 ):
     """Cancelar reunião."""
+    # Lock na linha: serializa com a criação do evento no Teams pela outbox,
+    # para que `teams_event_id` lido aqui já inclua um evento recém-criado
     result = await db.execute(
-        select(Reuniao).where(Reuniao.id == meeting_id)
+        select(Reuniao).where(Reuniao.id == meeting_id).with_for_update()
     )
     reuniao = result.scalar_one_or_none()
     
@@ -456,15 +1053,22 @@ async def cancel_meeting(
     if reuniao.organizador_id != current_user.id:
         raise HTTPException(status_code=403, detail="Apenas o organizador pode cancelar")
     
-    # Cancelar evento no Teams se existir
+    # Cancelar evento no Teams (via outbox) se existir
     if reuniao.teams_event_id:
-        try:
-            await graph_service.cancel_calendar_event(reuniao.teams_event_id)
-        except Exception as e:
-            print(f"⚠️ Erro ao cancelar evento no Teams: {e}")
+        enqueue(db, TIPO_TEAMS_CANCELAR, {
+            "meeting_id": reuniao.id,
+            "event_id": reuniao.teams_event_id
+        })
     
     reuniao.status = 'cancelada'
+    if reuniao.teams_status == 'pendente':
+        # A outbox não cria mais o evento: status final para quem acompanha
+        reuniao.teams_status = 'cancelado'
+    reuniao.atualizado_em = datetime.now()
     await db.commit()
+    occupancy_index.remove(reuniao.sala_id, reuniao.id, reuniao.data_hora_inicio)
+    outbox_worker.notify()
+    await broadcaster.publish(EVENTO_CANCELADA, reuniao.sala_id, reuniao.data_hora_inicio, {"id": reuniao.id})
     
     return {"message": "Reunião cancelada com sucesso"}
 
@@ -476,11 +1080,12 @@ async def respond_to_meeting(
     db: AsyncSession = Depends(get_db)
 ):
     """Responder ao convite de reunião (aceitar/recusar)."""
-    # Buscar participante pelo token no banco
+    # Buscar participante pelo token
+    filtro = _filtro_token_convite(token)
     result = await db.execute(
         select(ParticipanteReuniao).options(
             selectinload(ParticipanteReuniao.reuniao)
-        ).where(ParticipanteReuniao.confirmation_token == token)
+        ).where(filtro)
     )
     participante = result.scalar_one_or_none()
     
@@ -490,21 +1095,37 @@ async def respond_to_meeting(
             detail="Token inválido ou já utilizado"
         )
     
-    meeting_title = participante.reuniao.titulo if participante.reuniao else "Reunião"
+    reuniao = participante.reuniao
+    meeting_title = reuniao.titulo if reuniao else "Reunião"
     
-    # Atualizar status
-    if response == "accept":
-        participante.status = "aceito"
-        status_text = "aceita"
-    else:
-        participante.status = "recusado"
-        status_text = "recusada"
+    # Atualizar status e limpar o token; repetir o filtro evita uso duplo
+    is_accepted = response == "accept"
+    novo_status = "aceito" if is_accepted else "recusado"
+    status_text = "aceita" if is_accepted else "recusada"
+    atualizado = await db.execute(
+        update(ParticipanteReuniao)
+        .where(ParticipanteReuniao.id == participante.id, filtro)
+        .values(status=novo_status, confirmation_token=None)
+    )
+    
+    if atualizado.rowcount != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Token inválido ou já utilizado"
+        )
     
-    # Limpar token após uso (opcional - previne reuso)
-    participante.confirmation_token = None
+    # Marcar a reunião como alterada (sincronização incremental)
+    if reuniao:
+        reuniao.atualizado_em = datetime.now()
     
     await db.commit()
     
+    if reuniao:
+        await broadcaster.publish(
+            EVENTO_RESPOSTA, reuniao.sala_id, reuniao.data_hora_inicio,
+            {"id": reuniao.id, "email": participante.email, "status": novo_status}
+        )
+    
     return {
         "message": f"Sua resposta foi registrada com sucesso!",
         "meeting_title": meeting_title,
@@ -519,12 +1140,11 @@ async def get_meeting_response_info(
     db: AsyncSession = Depends(get_db)
 ):
     """Obter informações do convite pelo token."""
-    # Buscar participante pelo token no banco
+    # Buscar participante pelo token
     result = await db.execute(
         select(ParticipanteReuniao).options(
-            selectinload(ParticipanteReuniao.reuniao).selectinload(Reuniao.sala),
             selectinload(ParticipanteReuniao.reuniao).selectinload(Reuniao.organizador)
-        ).where(ParticipanteReuniao.confirmation_token == token)
+        ).where(_filtro_token_convite(token))
     )
     participante = result.scalar_one_or_none()
     
@@ -539,159 +1159,14 @@ async def get_meeting_response_info(
     if not reuniao:
         raise HTTPException(status_code=404, detail="Reunião não encontrada")
     
+    sala = (await room_catalog.snapshot()).get(reuniao.sala_id)
+    
     return {
         "meeting_title": reuniao.titulo,
         "meeting_date": reuniao.data_hora_inicio.strftime("%d/%m/%Y"),
         "meeting_start": reuniao.data_hora_inicio.strftime("%H:%M"),
         "meeting_end": reuniao.data_hora_fim.strftime("%H:%M"),
-        "room_name": reuniao.sala.nome if reuniao.sala else "Sala",
+        "room_name": sala.nome if sala else "Sala",
         "organizer_name": reuniao.organizador.nome if reuniao.organizador else "Organizador",
         "participant_email": participante.email
     }
-
-
-@router.get("/confirm", response_class=HTMLResponse)
-async def confirm_meeting_attendance(
-    token: str,
-    response: str,
-    db: AsyncSession = Depends(get_db)
-):
-    """Confirmar presença via link do e-mail - retorna HTML diretamente."""
-    
-    # Verificar token
-    token_data = meeting_confirmation_tokens.get(token)
-    
-    if not token_data:
-        return HTMLResponse(content="""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Link Inválido</title>
-            <style>
-                body { font-family: 'Segoe UI', Arial, sans-serif; margin: 0; padding: 40px; background: linear-gradient(135deg, #f3b86b 0%, #fa993f 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }
-                .card { background: white; border-radius: 16px; padding: 40px; max-width: 400px; text-align: center; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }
-                .icon { width: 80px; height: 80px; background: #fee2e2; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 20px; font-size: 40px; }
-                h2 { margin: 0 0 10px; color: #333; }
-                p { color: #666; margin: 0; }
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <div class="icon">⚠️</div>
-                <h2>Link Inválido</h2>
-                <p>Este link já foi utilizado ou expirou.</p>
-            </div>
-        </body>
-        </html>
-        """, status_code=400)
-    
-    meeting_id = token_data["meeting_id"]
-    email = token_data["email"]
-    meeting_title = token_data["meeting_title"]
-    
-    # Buscar participante
-    result = await db.execute(
-        select(ParticipanteReuniao).where(
-            ParticipanteReuniao.reuniao_id == meeting_id,
-            ParticipanteReuniao.email == email
-        )
-    )
-    participante = result.scalar_one_or_none()
-    
-    if not participante:
-        return HTMLResponse(content="""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Erro</title>
-            <style>
-                body { font-family: 'Segoe UI', Arial, sans-serif; margin: 0; padding: 40px; background: linear-gradient(135deg, #f3b86b 0%, #fa993f 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }
-                .card { background: white; border-radius: 16px; padding: 40px; max-width: 400px; text-align: center; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }
-                .icon { width: 80px; height: 80px; background: #fee2e2; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 20px; font-size: 40px; }
-                h2 { margin: 0 0 10px; color: #333; }
-                p { color: #666; margin: 0; }
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <div class="icon">❌</div>
-                <h2>Participante não encontrado</h2>
-                <p>Não foi possível processar sua resposta.</p>
-            </div>
-        </body>
-        </html>
-        """, status_code=404)
-    
-    # Atualizar status
-    is_accepted = response == "accept"
-    if is_accepted:
-        participante.status = "aceito"
-    else:
-        participante.status = "recusado"
-    
-    await db.commit()
-    
-    # Remover token usado
-    del meeting_confirmation_tokens[token]
-    
-    # Retornar página HTML de confirmação
-    if is_accepted:
-        return HTMLResponse(content=f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Presença Confirmada!</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Arial, sans-serif; margin: 0; padding: 40px; background: linear-gradient(135deg, #f3b86b 0%, #fa993f 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }}
-                .card {{ background: white; border-radius: 16px; padding: 40px; max-width: 450px; text-align: center; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }}
-                .icon {{ width: 80px; height: 80px; background: #d1fae5; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 20px; font-size: 40px; }}
-                h2 {{ margin: 0 0 10px; color: #333; }}
-                p {{ color: #666; margin: 10px 0; }}
-                .meeting {{ background: #f8f9fa; border-radius: 8px; padding: 15px; margin: 20px 0; }}
-                .close {{ color: #999; font-size: 13px; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <div class="icon">✅</div>
-                <h2>Presença Confirmada!</h2>
-                <p>Você confirmou presença na reunião:</p>
-                <div class="meeting"><strong>{meeting_title}</strong></div>
-                <p>O organizador será notificado.</p>
-                <p class="close">Você pode fechar esta página.</p>
-            </div>
-        </body>
-        </html>
-        """)
-    else:
-        return HTMLResponse(content=f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>Convite Recusado</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Arial, sans-serif; margin: 0; padding: 40px; background: linear-gradient(135deg, #f3b86b 0%, #fa993f 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }}
-                .card {{ background: white; border-radius: 16px; padding: 40px; max-width: 450px; text-align: center; box-shadow: 0 10px 40px rgba(0,0,0,0.1); }}
-                .icon {{ width: 80px; height: 80px; background: #fee2e2; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 20px; font-size: 40px; }}
-                h2 {{ margin: 0 0 10px; color: #333; }}
-                p {{ color: #666; margin: 10px 0; }}
-                .meeting {{ background: #f8f9fa; border-radius: 8px; padding: 15px; margin: 20px 0; }}
-                .close {{ color: #999; font-size: 13px; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <div class="icon">❌</div>
-                <h2>Convite Recusado</h2>
-                <p>Você recusou o convite para a reunião:</p>
-                <div class="meeting"><strong>{meeting_title}</strong></div>
-                <p>O organizador será notificado.</p>
-                <p class="close">Você pode fechar esta página.</p>
-            </div>
-        </body>
-        </html>
-        """)
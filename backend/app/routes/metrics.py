@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.routes.auth import get_current_user
+from app.services.outbox_service import outbox_worker
+from app.services.graph_service import graph_service
+from app.services.user_cache import user_cache
+from app.services.token_revocation import token_revocation
+from app.services.password_hasher import password_hasher
+from app.services.broadcaster import broadcaster
+from app.services.room_catalog import room_catalog
+from app.config import get_settings
+
+settings = get_settings()
+
+# Contadores internos: somente para usuários autenticados
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+# =====================
+# Endpoints
+# =====================
+@router.get("/outbox")
+async def get_outbox_metrics(db: AsyncSession = Depends(get_db)):
+    """Profundidade e atraso da fila de efeitos colaterais (e-mail/Teams)."""
+    return await outbox_worker.metrics(db)
+
+
+@router.get("/graph")
+async def get_graph_metrics():
+    """Obtenção de tokens do Azure AD: buscas, falhas e tempo de espera."""
+    return graph_service.metrics()
+
+
+@router.get("/auth")
+async def get_auth_metrics():
+    """Autenticação: modo, cache de usuários e registro de revogação."""
+    return {
+        "mode": settings.auth_mode,
+        "user_cache": user_cache.metrics(),
+        "revocation": token_revocation.metrics(),
+        "password_hasher": password_hasher.metrics()
+    }
+
+
+@router.get("/realtime")
+async def get_realtime_metrics():
+    """Clientes conectados ao stream do calendário e eventos distribuídos."""
+    return broadcaster.metrics()
+
+
+@router.get("/rooms")
+async def get_room_catalog_metrics():
+    """Catálogo de salas em memória: versão, recargas e conferências."""
+    return room_catalog.metrics()
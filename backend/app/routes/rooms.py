@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 from typing import List
-from datetime import datetime, date
-from app.database import get_db, Sala, RecursoSala, Reuniao, Usuario
+from datetime import datetime
+from app.database import get_db, Usuario
 from app.routes.auth import get_current_user
+from app.services.availability_service import availability_service
+from app.services.room_catalog import room_catalog
+from app.services.etag import make_etag, etag_matches, not_modified, etag_headers
+from app.services.json_response import FastJSONResponse
 
-router = APIRouter(prefix="/api/rooms", tags=["rooms"])
+router = APIRouter(prefix="/api/rooms", tags=["rooms"], default_response_class=FastJSONResponse)
 
 
 # =====================
@@ -31,55 +33,45 @@ class RoomResponse(BaseModel):
 # =====================
 @router.get("/", response_model=List[RoomResponse])
 async def get_rooms(
+    request: Request,
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Listar todas as salas ativas (304 se o If-None-Match conferir)."""
+    # Catálogo em memória: a versão dele também é a ETag
+    catalogo = await room_catalog.snapshot()
+    etag = make_etag("rooms", catalogo.versao)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    return FastJSONResponse([sala.to_dict() for sala in catalogo.ativas], headers=etag_headers(etag))
+
+
+@router.get("/available/list", response_model=List[RoomResponse])
+async def get_available_rooms(
+    start: str = Query(...),
+    end: str = Query(...),
     current_user: Usuario = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Listar todas as salas ativas."""
-    # Buscar salas com recursos
-    result = await db.execute(
-        select(Sala)
-        .options(selectinload(Sala.recursos))
-        .where(Sala.ativa == True)
-        .order_by(Sala.nome)
-    )
-    salas = result.scalars().all()
+    """Listar salas ativas livres no intervalo informado."""
+    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+    end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
     
-    # Formatar resposta
-    return [
-        RoomResponse(
-            id=sala.id,
-            name=sala.nome,
-            capacity=sala.capacidade,
-            color=sala.cor,
-            resources=[r.nome_recurso for r in sala.recursos],
-            is_active=sala.ativa
-        )
-        for sala in salas
-    ]
+    if end_dt <= start_dt:
+        raise HTTPException(status_code=400, detail="Horário de término deve ser após o início")
+    
+    return await availability_service.get_available_rooms(db, start_dt, end_dt)
 
 
 @router.get("/{room_id}", response_model=RoomResponse)
 async def get_room(
     room_id: int,
-    current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Usuario = Depends(get_current_user)
 ):
     """Obter uma sala específica."""
-    result = await db.execute(
-        select(Sala)
-        .options(selectinload(Sala.recursos))
-        .where(Sala.id == room_id)
-    )
-    sala = result.scalar_one_or_none()
+    sala = (await room_catalog.snapshot()).get(room_id)
     
     if not sala:
         raise HTTPException(status_code=404, detail="Sala não encontrada")
     
-    return RoomResponse(
-        id=sala.id,
-        name=sala.nome,
-        capacity=sala.capacidade,
-        color=sala.cor,
-        resources=[r.nome_recurso for r in sala.recursos],
-        is_active=sala.ativa
-    )
+    return FastJSONResponse(sala.to_dict())
@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.config import get_settings
 from app.database import Usuario
+from app.services.user_cache import user_cache
+from app.services.token_revocation import token_revocation
 
 settings = get_settings()
 
@@ -20,6 +22,8 @@ class AuthService:
             "sub": str(usuario.id),
             "email": usuario.email,
             "nome": usuario.nome,
+            "ativo": usuario.ativo is not False,
+            "ver": usuario.token_version or 0,
             "exp": expire
         }
         
@@ -58,14 +62,52 @@ class AuthService:
         if not user_id:
             return None
         
+        if settings.auth_mode == "claims":
+            return self.get_user_from_claims(payload)
+        
+        # Caso comum: usuário em cache, sem consulta ao banco
+        if settings.user_cache_enabled:
+            usuario = user_cache.get(user_id)
+            if usuario is not None:
+                return self._verificar_versao(usuario, payload)
+        
         try:
             result = await db.execute(
                 select(Usuario).where(Usuario.id == int(user_id))
             )
             usuario = result.scalar_one_or_none()
-            return usuario
         except:
             return None
+        
+        if usuario is not None and settings.user_cache_enabled:
+            usuario = user_cache.put(user_id, usuario)
+        return self._verificar_versao(usuario, payload)
+    
+    @staticmethod
+    def _verificar_versao(usuario: Optional[Usuario], payload: dict) -> Optional[Usuario]:
+        """Rejeitar tokens emitidos antes do último incremento de token_version."""
+        if usuario is None or payload.get("ver", 0) < (usuario.token_version or 0):
+            return None
+        return usuario
+    
+    def get_user_from_claims(self, payload: dict) -> Optional[Usuario]:
+        """Montar o usuário apenas com as claims do token, sem consultar o banco.
+        
+        A revogação (usuário inativo ou token_version incrementada) é
+        verificada no registro em memória `token_revocation`.
+        """
+        try:
+            user_id = int(payload["sub"])
+            email = payload["email"]
+            nome = payload["nome"]
+        except (KeyError, TypeError, ValueError):
+            return None
+        
+        versao = payload.get("ver", 0)
+        if not payload.get("ativo", True) or token_revocation.is_revoked(user_id, versao):
+            return None
+        
+        return Usuario(id=user_id, email=email, nome=nome, ativo=True, token_version=versao)
 
 
 # Singleton instance
@@ -0,0 +1,78 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.database import Reuniao
+from app.services.room_catalog import room_catalog
+
+
+class AvailabilityService:
+    """Motor de disponibilidade de salas baseado em consultas de conjunto."""
+
+    @staticmethod
+    def _conflito(start_dt: datetime, end_dt: datetime):
+        """Condição de sobreposição com reuniões agendadas."""
+        return and_(
+            Reuniao.status == 'agendada',
+            Reuniao.data_hora_inicio < end_dt,
+            Reuniao.data_hora_fim > start_dt
+        )
+
+    async def find_conflict(
+        self,
+        db: AsyncSession,
+        room_id: int,
+        start_dt: datetime,
+        end_dt: datetime,
+        exclude_meeting_id: Optional[int] = None
+    ) -> Optional[Reuniao]:
+        """Retorna a primeira reunião que conflita com o horário na sala, se houver."""
+        query = select(Reuniao).where(
+            Reuniao.sala_id == room_id,
+            self._conflito(start_dt, end_dt)
+        )
+
+        if exclude_meeting_id:
+            query = query.where(Reuniao.id != exclude_meeting_id)
+
+        result = await db.execute(query.order_by(Reuniao.data_hora_inicio).limit(1))
+        return result.scalars().first()
+
+    async def get_available_rooms(
+        self,
+        db: AsyncSession,
+        start_dt: datetime,
+        end_dt: datetime,
+        exclude_room_id: Optional[int] = None,
+        exclude_meeting_id: Optional[int] = None
+    ) -> List[dict]:
+        """Listar salas ativas livres no intervalo, com seus recursos.
+
+        Uma única consulta (salas ocupadas no intervalo); nomes, cores e
+        recursos vêm do catálogo de salas em memória.
+        """
+        conflito = self._conflito(start_dt, end_dt)
+        if exclude_meeting_id:
+            conflito = and_(conflito, Reuniao.id != exclude_meeting_id)
+
+        result = await db.execute(select(Reuniao.sala_id).where(conflito).distinct())
+        ocupadas = set(result.scalars())
+        if exclude_room_id:
+            ocupadas.add(exclude_room_id)
+
+        catalogo = await room_catalog.snapshot()
+        return [
+            {
+                "id": sala.id,
+                "name": sala.nome,
+                "capacity": sala.capacidade,
+                "color": sala.cor,
+                "resources": list(sala.recursos)
+            }
+            for sala in catalogo.ativas
+            if sala.id not in ocupadas
+        ]
+
+
+# Singleton instance
+availability_service = AvailabilityService()
@@ -0,0 +1,131 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, Optional, Set
+from app.config import get_settings
+
+settings = get_settings()
+
+# Tipos de evento publicados pelas rotas de reuniões
+EVENTO_CRIADA = "meeting.created"
+EVENTO_CANCELADA = "meeting.cancelled"
+EVENTO_RESPOSTA = "meeting.rsvp"
+# Enviado a um assinante que ficou para trás: o cliente deve recarregar
+EVENTO_RESET = "reset"
+
+
+def _sem_fuso(dt: Optional[datetime]) -> Optional[datetime]:
+    # O banco guarda horários sem fuso; comparar da mesma forma
+    return dt.replace(tzinfo=None) if dt is not None else None
+
+
+class Subscription:
+    """Assinatura de um cliente: fila própria + filtro por período e salas."""
+
+    def __init__(
+        self,
+        usuario_id: int,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        salas: Optional[Iterable[int]] = None
+    ):
+        self.usuario_id = usuario_id
+        self.inicio = _sem_fuso(inicio)
+        self.fim = _sem_fuso(fim)
+        self.salas: Optional[Set[int]] = set(salas) if salas else None
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=settings.realtime_queue_size)
+
+    def aceita(self, sala_id: int, inicio: datetime) -> bool:
+        """Mesmo critério do calendário: início da reunião dentro do período."""
+        if self.salas is not None and sala_id not in self.salas:
+            return False
+        inicio = _sem_fuso(inicio)
+        if self.inicio is not None and inicio < self.inicio:
+            return False
+        if self.fim is not None and inicio > self.fim:
+            return False
+        return True
+
+
+class Broadcaster(ABC):
+    """Distribuição de eventos de reuniões para os clientes conectados.
+
+    Cada processo entrega os eventos às suas próprias assinaturas
+    (`_entregar`). A implementação em memória publica direto nelas; um backend
+    entre processos (Redis, Postgres LISTEN/NOTIFY...) sobrescreve `publish`
+    para enviar ao canal compartilhado e chama `_entregar` ao receber, com
+    `start`/`stop` cuidando da conexão.
+    """
+
+    def __init__(self):
+        self._assinaturas: Set[Subscription] = set()
+        self.publicados = 0
+        self.entregues = 0
+        self.descartados = 0
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        self._assinaturas.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._assinaturas.discard(subscription)
+
+    @abstractmethod
+    async def publish(self, tipo: str, sala_id: int, inicio: datetime, dados: dict):
+        """Publicar um evento (chamar depois do commit)."""
+
+    def _entregar(self, tipo: str, sala_id: int, inicio: datetime, dados: dict):
+        """Enfileirar o evento para as assinaturas locais interessadas.
+
+        Nunca bloqueia: um cliente lento com a fila cheia recebe um único
+        `reset` e é desligado; ao reconectar ele recarrega o calendário.
+        """
+        self.publicados += 1
+        for sub in list(self._assinaturas):
+            if not sub.aceita(sala_id, inicio):
+                continue
+            try:
+                sub.fila.put_nowait((tipo, dados))
+                self.entregues += 1
+            except asyncio.QueueFull:
+                self._desligar(sub)
+                self.descartados += 1
+
+    def _desligar(self, sub: Subscription):
+        self.unsubscribe(sub)
+        while not sub.fila.empty():
+            sub.fila.get_nowait()
+        sub.fila.put_nowait((EVENTO_RESET, {}))
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        """Encerrar os streams abertos (o cliente reconecta em outro processo)."""
+        for sub in list(self._assinaturas):
+            self._desligar(sub)
+
+    def metrics(self) -> dict:
+        return {
+            "subscribers": len(self._assinaturas),
+            "published": self.publicados,
+            "delivered": self.entregues,
+            "dropped_subscribers": self.descartados
+        }
+
+
+class MemoryBroadcaster(Broadcaster):
+    """Broadcaster de um único processo (uvicorn com um worker)."""
+
+    async def publish(self, tipo: str, sala_id: int, inicio: datetime, dados: dict):
+        self._entregar(tipo, sala_id, inicio, dados)
+
+
+def criar_broadcaster(backend: str) -> Broadcaster:
+    if backend == "memory":
+        return MemoryBroadcaster()
+    raise ValueError(f"realtime_backend inválido: {backend}")
+
+
+# Singleton instance
+broadcaster = criar_broadcaster(settings.realtime_backend)
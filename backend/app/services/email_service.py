@@ -1,12 +1,47 @@
-import smtplib
+import asyncio
+import time
+from collections import deque
+from email import base64mime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+import aiosmtplib
 from app.config import get_settings
+from app.services.smtp_pool import SMTPPool
 
 settings = get_settings()
 
+# Marcadores dos dados de cada participante no convite pré-renderizado
+_NOME = "\x00nome\x00"
+_TOKEN = "\x00token\x00"
+
+# Marcadores da mensagem MIME serializada uma única vez por lote
+_DESTINATARIO = b"@@destinatario@@"
+_CORPO_TEXTO = "@@corpo-texto@@"
+_CORPO_HTML = "@@corpo-html@@"
+
+# Recusas de um envio (destinatário, remetente ou mensagem): a sessão continua
+# utilizável. SMTPRecipientsRefused não herda de SMTPResponseException.
+_RECUSAS = (
+    aiosmtplib.SMTPRecipientsRefused,
+    aiosmtplib.SMTPRecipientRefused,
+    aiosmtplib.SMTPResponseException
+)
+
+# Falhas da conexão/transporte: a sessão foi perdida
+_FALHAS_DE_TRANSPORTE = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    asyncio.TimeoutError,
+    OSError
+)
+
+
+class EnvioInterrompido(Exception):
+    """Envio em lote interrompido antes do fim (prazo esgotado)."""
+
 
 class EmailService:
     """Serviço para envio de e-mails."""
@@ -18,11 +53,43 @@ class EmailService:
         self.smtp_password = getattr(settings, 'smtp_password', '')
         self.from_email = getattr(settings, 'email_from', self.smtp_user)
         self.from_name = getattr(settings, 'email_from_name', 'Sistema de Agendamento')
+        self.pool = SMTPPool(
+            host=self.smtp_host,
+            port=self.smtp_port,
+            user=self.smtp_user,
+            password=self.smtp_password,
+            start_tls=settings.smtp_starttls,
+            size=settings.smtp_pool_size,
+            timeout=settings.smtp_timeout,
+            keepalive_seconds=settings.smtp_keepalive_seconds
+        )
     
     def _is_configured(self) -> bool:
         """Verifica se o serviço de e-mail está configurado."""
         return bool(self.smtp_user and self.smtp_password)
     
+    def _montar_mensagem(
+        self,
+        to_email: str,
+        subject: str,
+        html_body: str,
+        text_body: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Monta a mensagem MIME (texto opcional + HTML)."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        
+        if text_body:
+            part1 = MIMEText(text_body, 'plain')
+            msg.attach(part1)
+        
+        part2 = MIMEText(html_body, 'html')
+        msg.attach(part2)
+        
+        return msg
+    
     async def send_email(
         self,
         to_email: str,
@@ -36,22 +103,8 @@ class EmailService:
             return False
         
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            if text_body:
-                part1 = MIMEText(text_body, 'plain')
-                msg.attach(part1)
-            
-            part2 = MIMEText(html_body, 'html')
-            msg.attach(part2)
-            
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, to_email, msg.as_string())
+            msg = self._montar_mensagem(to_email, subject, html_body, text_body)
+            await self.pool.send(msg, sender=self.from_email)
             
             print(f"✅ E-mail enviado para: {to_email}")
             return True
@@ -60,30 +113,29 @@ class EmailService:
             print(f"❌ Erro ao enviar e-mail para {to_email}: {e}")
             return False
     
-    async def send_meeting_invitation(
+    def _render_meeting_invitation(
         self,
-        to_email: str,
-        participant_name: Optional[str],
         meeting_title: str,
-        meeting_id: int,
         meeting_date: datetime,
         meeting_start: str,
         meeting_end: str,
         room_name: str,
         organizer_name: str,
         organizer_email: str,
-        confirmation_token: str,
         description: Optional[str] = None,
         teams_link: Optional[str] = None
-    ) -> bool:
-        """Envia convite de reunião por e-mail."""
+    ) -> Tuple[str, str, str]:
+        """Renderiza a parte do convite comum a todos os participantes.
         
+        Retorna (assunto, html, texto) com os marcadores _NOME e _TOKEN, que
+        são substituídos por participante em _personalizar_convite.
+        """
         date_formatted = meeting_date.strftime("%d/%m/%Y")
         frontend_url = getattr(settings, 'frontend_url', 'http://localhost:5173')
         
         # URLs de confirmação - apontam para o frontend
-        accept_url = f"{frontend_url}/meeting-response?token={confirmation_token}&response=accept"
-        decline_url = f"{frontend_url}/meeting-response?token={confirmation_token}&response=decline"
+        accept_url = f"{frontend_url}/meeting-response?token={_TOKEN}&response=accept"
+        decline_url = f"{frontend_url}/meeting-response?token={_TOKEN}&response=decline"
         
         subject = f"📅 Convite para Reunião: {meeting_title}"
         
@@ -99,7 +151,7 @@ class EmailService:
                     <h1 style="margin: 0; font-size: 24px;">📅 Você foi convidado para uma reunião!</h1>
                 </div>
                 <div style="padding: 30px;">
-                    <p>Olá{(' ' + participant_name) if participant_name else ''},</p>
+                    <p>Olá{_NOME},</p>
                     <p><strong>{organizer_name}</strong> convidou você para participar de uma reunião.</p>
                     
                     <div style="background: #f8f9fa; border-radius: 8px; padding: 20px; margin: 20px 0;">
@@ -150,8 +202,153 @@ Para RECUSAR: {decline_url}
 {f'Entrar pelo Teams: {teams_link}' if teams_link else ''}
 """
         
+        return subject, html_body, text_body
+    
+    @staticmethod
+    def _personalizar_convite(template: str, participant_name: Optional[str], confirmation_token: str) -> str:
+        """Substitui os marcadores do participante no convite renderizado."""
+        return template.replace(
+            _NOME, (' ' + participant_name) if participant_name else ''
+        ).replace(_TOKEN, confirmation_token)
+    
+    def _serializar_lote(self, subject: str) -> bytes:
+        """Serializa uma vez os cabeçalhos e a estrutura MIME de um lote.
+        
+        Destinatário e corpos (texto e HTML, em base64) ficam como marcadores,
+        preenchidos por participante em _mensagem_do_lote.
+        """
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = _DESTINATARIO.decode()
+        
+        for corpo, subtipo in ((_CORPO_TEXTO, 'plain'), (_CORPO_HTML, 'html')):
+            parte = MIMEText('', subtipo, 'utf-8')
+            parte.set_payload(corpo)
+            msg.attach(parte)
+        
+        return msg.as_bytes()
+    
+    @staticmethod
+    def _mensagem_do_lote(modelo: bytes, to_email: str, text_body: str, html_body: str) -> bytes:
+        """Preenche a mensagem serializada com os dados de um participante."""
+        return modelo.replace(
+            _DESTINATARIO, to_email.encode()
+        ).replace(
+            _CORPO_TEXTO.encode(), base64mime.body_encode(text_body.encode('utf-8')).encode()
+        ).replace(
+            _CORPO_HTML.encode(), base64mime.body_encode(html_body.encode('utf-8')).encode()
+        )
+    
+    async def send_meeting_invitation(
+        self,
+        to_email: str,
+        participant_name: Optional[str],
+        meeting_title: str,
+        meeting_id: int,
+        meeting_date: datetime,
+        meeting_start: str,
+        meeting_end: str,
+        room_name: str,
+        organizer_name: str,
+        organizer_email: str,
+        confirmation_token: str,
+        description: Optional[str] = None,
+        teams_link: Optional[str] = None
+    ) -> bool:
+        """Envia convite de reunião por e-mail."""
+        subject, html_template, text_template = self._render_meeting_invitation(
+            meeting_title, meeting_date, meeting_start, meeting_end, room_name,
+            organizer_name, organizer_email, description, teams_link
+        )
+        
+        html_body = self._personalizar_convite(html_template, participant_name, confirmation_token)
+        text_body = self._personalizar_convite(text_template, participant_name, confirmation_token)
+        
         return await self.send_email(to_email, subject, html_body, text_body)
     
+    async def send_meeting_invitations(
+        self,
+        attendees: List[dict],
+        meeting_title: str,
+        meeting_id: int,
+        meeting_date: datetime,
+        meeting_start: str,
+        meeting_end: str,
+        room_name: str,
+        organizer_name: str,
+        organizer_email: str,
+        description: Optional[str] = None,
+        teams_link: Optional[str] = None,
+        concluidos: Optional[List[str]] = None,
+        prazo: Optional[float] = None
+    ) -> int:
+        """Envia os convites de uma reunião em lote.
+        
+        O corpo é renderizado uma única vez e todos os e-mails seguem pela
+        mesma sessão SMTP. `attendees` contém dicts com 'email', 'name' e
+        'token'. Retorna o número de convites enviados.
+        
+        Destinatários recusados são registrados e ignorados. Se a conexão cair
+        (ou `prazo`, em `time.monotonic()`, for atingido) o envio é
+        interrompido com exceção; `concluidos` recebe os e-mails já tratados
+        (enviados ou recusados), para que uma nova tentativa envie só o resto.
+        """
+        if not attendees:
+            return 0
+        
+        if not self._is_configured():
+            print(f"⚠️ Convites não enviados (SMTP não configurado): {len(attendees)} participante(s)")
+            return 0
+        
+        subject, html_template, text_template = self._render_meeting_invitation(
+            meeting_title, meeting_date, meeting_start, meeting_end, room_name,
+            organizer_name, organizer_email, description, teams_link
+        )
+        
+        modelo = self._serializar_lote(subject)
+        pendentes = deque()
+        for att in attendees:
+            html_body = self._personalizar_convite(html_template, att.get("name"), att["token"])
+            text_body = self._personalizar_convite(text_template, att.get("name"), att["token"])
+            if att["email"].isascii():
+                msg = self._mensagem_do_lote(modelo, att["email"], text_body, html_body)
+            else:
+                msg = self._montar_mensagem(att["email"], subject, html_body, text_body)
+            pendentes.append((att["email"], msg))
+        enviados = 0
+        
+        for tentativa in range(2):
+            enviados_na_sessao = 0
+            try:
+                async with self.pool.connection(nova=tentativa > 0) as smtp:
+                    while pendentes:
+                        if prazo is not None and time.monotonic() >= prazo:
+                            raise EnvioInterrompido(
+                                f"Prazo de envio esgotado; {len(pendentes)} convite(s) pendente(s)"
+                            )
+                        to_email, msg = pendentes[0]
+                        try:
+                            await self.pool.send_with(smtp, msg, self.from_email, [to_email])
+                            enviados += 1
+                            enviados_na_sessao += 1
+                        except _RECUSAS as e:
+                            # Destinatário recusado: segue com os demais na mesma sessão
+                            print(f"❌ Erro ao enviar convite para {to_email}: {e}")
+                        pendentes.popleft()
+                        if concluidos is not None:
+                            concluidos.append(to_email)
+                break
+            except _FALHAS_DE_TRANSPORTE as e:
+                # Conexão ociosa do pool que já tinha caído: uma nova tentativa
+                if tentativa == 0 and enviados_na_sessao == 0:
+                    continue
+                print(f"⚠️ Sessão SMTP interrompida ({e}); {len(pendentes)} convite(s) pendente(s)")
+                raise
+        
+        print(f"✅ Convites enviados: {enviados}/{len(attendees)} (reunião {meeting_id})")
+        return enviados
+    
     async def send_meeting_cancellation(
         self,
         to_email: str,
@@ -194,5 +391,10 @@ Para RECUSAR: {decline_url}
         return await self.send_email(to_email, subject, html_body)
 
 
+    async def close(self):
+        """Encerrar as conexões SMTP mantidas no pool."""
+        await self.pool.close()
+
+
 # Instância singleton
 email_service = EmailService()
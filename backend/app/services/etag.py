@@ -0,0 +1,28 @@
+import hashlib
+from fastapi import Request, Response
+
+# O navegador guarda a resposta, mas revalida sempre (If-None-Match)
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*partes) -> str:
+    """ETag forte a partir das partes que identificam a versão dos dados."""
+    versao = "|".join(str(p) for p in partes)
+    return '"' + hashlib.sha1(versao.encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Verificar se o If-None-Match da requisição contém a ETag atual."""
+    cabecalho = request.headers.get("if-none-match")
+    if not cabecalho:
+        return False
+    candidatas = [c.strip() for c in cabecalho.split(",")]
+    return "*" in candidatas or etag in candidatas
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -1,22 +1,80 @@
+import asyncio
 import httpx
 import time
-from typing import Optional, List
+from typing import Awaitable, Optional, List
 from datetime import datetime
 from app.config import get_settings
 
 settings = get_settings()
 
+# Limite de requisições por chamada $batch imposto pelo Graph
+GRAPH_BATCH_MAX = 20
+
 
 class GraphService:
     """Service for Microsoft Graph API integration using client_credentials."""
     
-    GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
-    
-    def __init__(self):
+    def __init__(self, api_base: Optional[str] = None, login_base: Optional[str] = None):
+        self.api_base = (api_base or settings.graph_api_base).rstrip("/")
+        self.login_base = (login_base or settings.azure_login_base).rstrip("/")
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        # Busca de token em andamento (compartilhada pelas chamadas concorrentes)
+        self._token_refresh: Optional[asyncio.Future] = None
+        self._renovacao: Optional[asyncio.Task] = None
+        # Métricas de obtenção de token
+        self.token_requests = 0
+        self.token_fetches = 0
+        self.token_fetch_errors = 0
+        self.token_waits = 0
+        self.token_wait_seconds = 0.0
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP compartilhado (pool de conexões keep-alive)."""
+        http2 = settings.graph_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ HTTP/2 desativado para o Graph (instale httpx[http2])")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=settings.graph_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.graph_max_connections,
+                max_keepalive_connections=settings.graph_max_keepalive_connections,
+                keepalive_expiry=settings.graph_keepalive_expiry
+            )
+        )
     
-    def _is_configured(self) -> bool:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP de longa duração, criado sob demanda se necessário."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+    
+    async def start(self):
+        """Abre o cliente HTTP compartilhado e inicia a renovação do token (lifespan)."""
+        self.client
+        if self.is_configured and self._renovacao is None:
+            self._renovacao = asyncio.create_task(self._loop_renovacao())
+    
+    async def close(self):
+        """Para a renovação do token e fecha o cliente HTTP e suas conexões."""
+        if self._renovacao is not None:
+            self._renovacao.cancel()
+            await asyncio.gather(self._renovacao, return_exceptions=True)
+            self._renovacao = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def is_configured(self) -> bool:
         """Verifica se as credenciais Azure estão configuradas."""
         return bool(
             settings.azure_client_id and 
@@ -27,15 +85,36 @@ class GraphService:
     
     async def _get_access_token(self) -> Optional[str]:
         """Obtém token de acesso via client_credentials flow."""
-        if not self._is_configured():
+        if not self.is_configured:
             print("⚠️ Azure/Teams não configurado (credenciais faltando)")
             return None
         
+        self.token_requests += 1
+        
         # Usar token em cache se ainda válido
         if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
         
-        auth_url = f"https://login.microsoftonline.com/{settings.azure_tenant_id}/oauth2/v2.0/token"
+        # Token ausente ou expirado: esperar a busca em andamento (ou iniciar uma)
+        inicio = time.perf_counter()
+        try:
+            return await self._renovar_token()
+        finally:
+            self.token_waits += 1
+            self.token_wait_seconds += time.perf_counter() - inicio
+    
+    def _renovar_token(self) -> Awaitable[Optional[str]]:
+        """Renovação single-flight: chamadas concorrentes compartilham uma única busca.
+        
+        O shield impede que o cancelamento de quem espera cancele a busca dos demais.
+        """
+        if self._token_refresh is None:
+            self._token_refresh = asyncio.ensure_future(self._buscar_token())
+        return asyncio.shield(self._token_refresh)
+    
+    async def _buscar_token(self) -> Optional[str]:
+        """Solicita um novo token ao Azure AD e atualiza o cache."""
+        auth_url = f"{self.login_base}/{settings.azure_tenant_id}/oauth2/v2.0/token"
         auth_data = {
             "client_id": settings.azure_client_id,
             "scope": "https://graph.microsoft.com/.default",
@@ -44,40 +123,68 @@ class GraphService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(auth_url, data=auth_data)
-                response.raise_for_status()
-                token_data = response.json()
-                
-                self._access_token = token_data.get("access_token")
-                # Token expira em ~3600s, renovar 5 min antes
-                expires_in = token_data.get("expires_in", 3600)
-                self._token_expires_at = time.time() + expires_in - 300
-                
-                print("✅ Token Azure obtido com sucesso")
-                return self._access_token
+            self.token_fetches += 1
+            response = await self.client.post(auth_url, data=auth_data)
+            response.raise_for_status()
+            token_data = response.json()
+            
+            self._access_token = token_data.get("access_token")
+            # Token expira em ~3600s, renovar 5 min antes
+            expires_in = token_data.get("expires_in", 3600)
+            self._token_expires_at = time.time() + expires_in - 300
+            
+            print("✅ Token Azure obtido com sucesso")
+            return self._access_token
                 
         except Exception as e:
+            self.token_fetch_errors += 1
             print(f"❌ Erro ao obter token Azure: {e}")
             return None
+        finally:
+            self._token_refresh = None
     
-    async def create_calendar_event(
-        self,
+    async def _loop_renovacao(self):
+        """Renova o token antes de expirar, para que as requisições nunca esperem."""
+        while True:
+            try:
+                token = await self._renovar_token()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro na renovação do token Azure: {e}")
+                token = None
+            
+            if token is None:
+                espera = settings.graph_token_retry_seconds
+            else:
+                espera = max(
+                    self._token_expires_at - settings.graph_token_renew_ahead_seconds - time.time(),
+                    settings.graph_token_retry_seconds
+                )
+            await asyncio.sleep(espera)
+    
+    def metrics(self) -> dict:
+        """Contadores de obtenção de token e tempo de espera das requisições."""
+        return {
+            "token_requests": self.token_requests,
+            "token_fetches": self.token_fetches,
+            "token_fetch_errors": self.token_fetch_errors,
+            "token_waits": self.token_waits,
+            "token_wait_seconds": round(self.token_wait_seconds, 6),
+            "token_wait_avg_ms": round(self.token_wait_seconds / self.token_waits * 1000, 3) if self.token_waits else 0.0,
+            "token_valid_for_seconds": round(max(self._token_expires_at - time.time(), 0.0), 1) if self._access_token else 0.0,
+            "proactive_renewal": self._renovacao is not None and not self._renovacao.done()
+        }
+    
+    @staticmethod
+    def _montar_evento(
         subject: str,
         start: datetime,
         end: datetime,
         attendees: List[str] = None,
         description: str = None
-    ) -> Optional[dict]:
-        """Cria um evento de calendário no Outlook/Teams.
-        
-        Returns:
-            dict com 'join_url' (Teams link) e 'event_id', ou None se falhar
-        """
-        access_token = await self._get_access_token()
-        if not access_token:
-            return None
-        
+    ) -> dict:
+        """Monta o corpo JSON de um evento online (Teams)."""
         event_data = {
             "subject": subject,
             "body": {
@@ -108,36 +215,55 @@ class GraphService:
                 for email in attendees
             ]
         
-        endpoint = f"{self.GRAPH_API_BASE}/users/{settings.azure_organizer_email}/events"
+        return event_data
+    
+    async def create_calendar_event(
+        self,
+        subject: str,
+        start: datetime,
+        end: datetime,
+        attendees: List[str] = None,
+        description: str = None
+    ) -> Optional[dict]:
+        """Cria um evento de calendário no Outlook/Teams.
+        
+        Returns:
+            dict com 'join_url' (Teams link) e 'event_id', ou None se falhar
+        """
+        access_token = await self._get_access_token()
+        if not access_token:
+            return None
+        
+        event_data = self._montar_evento(subject, start, end, attendees, description)
+        
+        endpoint = f"{self.api_base}/users/{settings.azure_organizer_email}/events"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    endpoint,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=event_data,
-                    timeout=30.0
-                )
+            response = await self.client.post(
+                endpoint,
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                    "Content-Type": "application/json"
+                },
+                json=event_data
+            )
+            
+            if response.status_code == 201:
+                data = response.json()
+                # O link do Teams fica dentro de onlineMeeting.joinUrl
+                join_url = data.get("onlineMeeting", {}).get("joinUrl")
+                event_id = data.get("id")
+                
+                print(f"✅ Evento Teams criado! Link: {join_url}")
+                return {
+                    "join_url": join_url,
+                    "event_id": event_id
+                }
+            else:
+                error = response.json()
+                print(f"❌ Erro ao criar evento Teams ({response.status_code}): {error}")
+                return None
                 
-                if response.status_code == 201:
-                    data = response.json()
-                    # O link do Teams fica dentro de onlineMeeting.joinUrl
-                    join_url = data.get("onlineMeeting", {}).get("joinUrl")
-                    event_id = data.get("id")
-                    
-                    print(f"✅ Evento Teams criado! Link: {join_url}")
-                    return {
-                        "join_url": join_url,
-                        "event_id": event_id
-                    }
-                else:
-                    error = response.json()
-                    print(f"❌ Erro ao criar evento Teams ({response.status_code}): {error}")
-                    return None
-                    
         except Exception as e:
             print(f"❌ Erro ao criar evento Teams: {e}")
             return None
@@ -148,25 +274,126 @@ class GraphService:
         if not access_token or not event_id:
             return False
         
-        endpoint = f"{self.GRAPH_API_BASE}/users/{settings.azure_organizer_email}/events/{event_id}"
+        endpoint = f"{self.api_base}/users/{settings.azure_organizer_email}/events/{event_id}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    endpoint,
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    timeout=30.0
-                )
-                if response.status_code == 204:
-                    print("✅ Evento Teams cancelado")
-                    return True
-                else:
-                    print(f"❌ Erro ao cancelar evento Teams ({response.status_code})")
-                    return False
+            response = await self.client.delete(
+                endpoint,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            if response.status_code == 204:
+                print("✅ Evento Teams cancelado")
+                return True
+            else:
+                print(f"❌ Erro ao cancelar evento Teams ({response.status_code})")
+                return False
         except Exception as e:
             print(f"❌ Erro ao cancelar evento Teams: {e}")
             return False
 
 
+    # =====================
+    # Lote ($batch)
+    # =====================
+    async def batch(self, requests: List[dict]) -> List[dict]:
+        """Executa requisições via JSON $batch do Graph (até 20 por chamada).
+        
+        Cada item de `requests` tem 'method', 'url' (relativa à API, ex.:
+        "/users/x/events") e opcionalmente 'body'. Retorna, na mesma ordem,
+        dicts com 'status' e 'body' de cada item; status 0 indica que o
+        lote inteiro falhou (rede, token ou erro HTTP da chamada $batch).
+        """
+        if not requests:
+            return []
+        
+        access_token = await self._get_access_token()
+        if not access_token:
+            return [{"status": 0, "body": None} for _ in requests]
+        
+        tamanho = max(1, min(settings.graph_batch_size, GRAPH_BATCH_MAX))
+        lotes = [requests[i:i + tamanho] for i in range(0, len(requests), tamanho)]
+        resultados = await asyncio.gather(*(self._enviar_lote(access_token, lote) for lote in lotes))
+        return [item for lote in resultados for item in lote]
+    
+    async def _enviar_lote(self, access_token: str, lote: List[dict]) -> List[dict]:
+        """Envia um único $batch e ordena as respostas pelos ids dos itens."""
+        corpo = {"requests": []}
+        for i, req in enumerate(lote):
+            item = {"id": str(i), "method": req["method"], "url": req["url"]}
+            if req.get("body") is not None:
+                item["body"] = req["body"]
+                item["headers"] = {"Content-Type": "application/json"}
+            corpo["requests"].append(item)
+        
+        try:
+            response = await self.client.post(
+                f"{self.api_base}/$batch",
+                headers={"Authorization": f"Bearer {access_token}"},
+                json=corpo
+            )
+            response.raise_for_status()
+            respostas = {r["id"]: r for r in response.json().get("responses", [])}
+        except Exception as e:
+            print(f"❌ Erro no $batch do Graph ({len(lote)} itens): {e}")
+            return [{"status": 0, "body": None} for _ in lote]
+        
+        return [
+            {
+                "status": respostas.get(str(i), {}).get("status", 0),
+                "body": respostas.get(str(i), {}).get("body")
+            }
+            for i in range(len(lote))
+        ]
+    
+    async def create_calendar_events(self, events: List[dict]) -> List[Optional[dict]]:
+        """Cria vários eventos em lote.
+        
+        `events` são dicts com os argumentos de create_calendar_event. Retorna,
+        na mesma ordem, {'join_url', 'event_id'} ou None para itens que falharam.
+        """
+        url = f"/users/{settings.azure_organizer_email}/events"
+        respostas = await self.batch([
+            {"method": "POST", "url": url, "body": self._montar_evento(**event)}
+            for event in events
+        ])
+        
+        resultados = []
+        for event, resposta in zip(events, respostas):
+            if resposta["status"] == 201:
+                data = resposta["body"] or {}
+                resultados.append({
+                    "join_url": data.get("onlineMeeting", {}).get("joinUrl"),
+                    "event_id": data.get("id")
+                })
+            else:
+                if resposta["status"]:
+                    print(f"❌ Erro ao criar evento Teams '{event.get('subject')}' ({resposta['status']}): {resposta['body']}")
+                resultados.append(None)
+        
+        criados = sum(1 for r in resultados if r)
+        print(f"✅ Eventos Teams criados em lote: {criados}/{len(events)}")
+        return resultados
+    
+    async def cancel_calendar_events(self, event_ids: List[str]) -> List[bool]:
+        """Cancela vários eventos em lote. Retorna um bool por evento, na mesma ordem.
+        
+        Evento já inexistente (404) conta como cancelado.
+        """
+        respostas = await self.batch([
+            {"method": "DELETE", "url": f"/users/{settings.azure_organizer_email}/events/{event_id}"}
+            for event_id in event_ids
+        ])
+        
+        resultados = []
+        for event_id, resposta in zip(event_ids, respostas):
+            ok = resposta["status"] in (204, 404)
+            if not ok and resposta["status"]:
+                print(f"❌ Erro ao cancelar evento Teams {event_id} ({resposta['status']})")
+            resultados.append(ok)
+        
+        print(f"✅ Eventos Teams cancelados em lote: {sum(resultados)}/{len(event_ids)}")
+        return resultados
+
+
 # Singleton instance
 graph_service = GraphService()
@@ -0,0 +1,15 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON codificada direto em bytes pelo orjson.
+    
+    datetime e date são serializados nativamente (ISO 8601, mesmo formato de
+    `.isoformat()`). Quando a rota retorna a instância diretamente, o
+    `jsonable_encoder` do FastAPI também é evitado; como
+    `default_response_class`, o conteúdo ainda passa por ele antes.
+    """
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,189 @@
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from app.config import get_settings
+from app.database import AsyncSessionLocal, Reuniao
+
+settings = get_settings()
+
+_EPOCH = datetime(1970, 1, 1)
+_UM_SEGUNDO = timedelta(seconds=1)
+
+
+def _ts(dt: datetime) -> int:
+    """Converter datetime em segundos (ignorando fuso, como o MySQL faz)."""
+    return (dt.replace(tzinfo=None) - _EPOCH) // _UM_SEGUNDO
+
+
+class _IntervalosSala:
+    """Reuniões de uma sala em arrays paralelos ordenados pelo início."""
+
+    __slots__ = ("inicios", "fins", "ids", "duracao_max")
+
+    def __init__(self):
+        self.inicios = array('q')
+        self.fins = array('q')
+        self.ids = array('q')
+        self.duracao_max = 0
+
+    def adicionar(self, reuniao_id: int, inicio: int, fim: int):
+        pos = bisect_right(self.inicios, inicio)
+        self.inicios.insert(pos, inicio)
+        self.fins.insert(pos, fim)
+        self.ids.insert(pos, reuniao_id)
+        if fim - inicio > self.duracao_max:
+            self.duracao_max = fim - inicio
+
+    def remover(self, reuniao_id: int, inicio: int) -> bool:
+        pos = bisect_left(self.inicios, inicio)
+        while pos < len(self.inicios) and self.inicios[pos] == inicio:
+            if self.ids[pos] == reuniao_id:
+                del self.inicios[pos]
+                del self.fins[pos]
+                del self.ids[pos]
+                return True
+            pos += 1
+        return False
+
+    def conflito(self, inicio: int, fim: int, excluir_id: Optional[int] = None) -> Optional[int]:
+        # Só podem sobrepor reuniões que começam antes do fim e depois de
+        # (inicio - maior duração); o resto do array é ignorado.
+        lo = bisect_right(self.inicios, inicio - self.duracao_max)
+        hi = bisect_left(self.inicios, fim)
+        for k in range(lo, hi):
+            if self.fins[k] > inicio and self.ids[k] != excluir_id:
+                return self.ids[k]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class OccupancyIndex:
+    """Índice em memória das reuniões agendadas por sala.
+
+    Responde verificações de disponibilidade sem ir ao banco. É carregado na
+    inicialização, atualizado na criação/cancelamento e reconciliado
+    periodicamente com o MySQL. A verificação definitiva na criação de
+    reuniões continua sendo feita no banco.
+    """
+
+    def __init__(self):
+        self._salas: Dict[int, _IntervalosSala] = {}
+        self._horizonte: Optional[int] = None
+        self._reconstruindo = False
+        self._pendentes: List[Tuple] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._horizonte is not None
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self._salas.values())
+
+    def pode_responder(self, start_dt: datetime) -> bool:
+        """Indica se o índice cobre o horário (reuniões antigas não são carregadas)."""
+        return self.ativo and _ts(start_dt) >= self._horizonte
+
+    def find_conflict(
+        self,
+        room_id: int,
+        start_dt: datetime,
+        end_dt: datetime,
+        exclude_meeting_id: Optional[int] = None
+    ) -> Optional[int]:
+        """Retorna o id de uma reunião conflitante na sala, se houver."""
+        sala = self._salas.get(room_id)
+        if sala is None:
+            return None
+        return sala.conflito(_ts(start_dt), _ts(end_dt), exclude_meeting_id)
+
+    def add(self, room_id: int, meeting_id: int, start_dt: datetime, end_dt: datetime):
+        """Registrar uma reunião agendada."""
+        if not self.ativo:
+            return
+        if self._reconstruindo:
+            self._pendentes.append(("add", room_id, meeting_id, start_dt, end_dt))
+        self._adicionar(self._salas, room_id, meeting_id, _ts(start_dt), _ts(end_dt))
+
+    def remove(self, room_id: int, meeting_id: int, start_dt: datetime):
+        """Remover uma reunião cancelada."""
+        if not self.ativo:
+            return
+        if self._reconstruindo:
+            self._pendentes.append(("remove", room_id, meeting_id, start_dt))
+        sala = self._salas.get(room_id)
+        if sala is not None:
+            sala.remover(meeting_id, _ts(start_dt))
+
+    @staticmethod
+    def _adicionar(salas: Dict[int, _IntervalosSala], room_id: int, meeting_id: int, inicio: int, fim: int):
+        sala = salas.get(room_id)
+        if sala is None:
+            sala = salas[room_id] = _IntervalosSala()
+        sala.adicionar(meeting_id, inicio, fim)
+
+    async def load(self):
+        """(Re)carregar o índice a partir do banco e trocar de forma atômica."""
+        horizonte = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        salas: Dict[int, _IntervalosSala] = {}
+
+        self._reconstruindo = True
+        self._pendentes = []
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.stream(
+                    select(
+                        Reuniao.sala_id,
+                        Reuniao.id,
+                        Reuniao.data_hora_inicio,
+                        Reuniao.data_hora_fim
+                    ).where(
+                        Reuniao.status == 'agendada',
+                        Reuniao.data_hora_fim >= horizonte
+                    ).order_by(Reuniao.sala_id, Reuniao.data_hora_inicio)
+                    .execution_options(yield_per=5000)
+                )
+                async for sala_id, reuniao_id, inicio, fim in result:
+                    self._adicionar(salas, sala_id, reuniao_id, _ts(inicio), _ts(fim))
+
+            # Reaplicar alterações feitas durante a reconstrução
+            for op in self._pendentes:
+                room_id, meeting_id, start_dt = op[1:4]
+                if room_id in salas:
+                    salas[room_id].remover(meeting_id, _ts(start_dt))
+                if op[0] == "add":
+                    self._adicionar(salas, room_id, meeting_id, _ts(start_dt), _ts(op[4]))
+
+            self._salas = salas
+            self._horizonte = _ts(horizonte)
+        finally:
+            self._reconstruindo = False
+            self._pendentes = []
+
+    async def _loop_reconciliacao(self):
+        while True:
+            await asyncio.sleep(settings.occupancy_index_reconcile_seconds)
+            try:
+                await self.load()
+            except Exception as e:
+                print(f"⚠️ Erro ao reconciliar índice de ocupação: {e}")
+
+    async def start(self):
+        """Carregar o índice e iniciar a reconciliação periódica."""
+        await self.load()
+        self._task = asyncio.create_task(self._loop_reconciliacao())
+        print(f"✅ Índice de ocupação carregado ({len(self)} reuniões)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+# Singleton instance
+occupancy_index = OccupancyIndex()
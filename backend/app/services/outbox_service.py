@@ -0,0 +1,391 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import AsyncSessionLocal, OutboxJob, Reuniao
+from app.services.email_service import email_service
+from app.services.graph_service import graph_service
+
+settings = get_settings()
+
+# Tipos de job
+TIPO_CONVITES = "email.convites"
+TIPO_TEAMS_CRIAR = "teams.criar_evento"
+TIPO_TEAMS_CANCELAR = "teams.cancelar_evento"
+
+Handler = Callable[[AsyncSession, OutboxJob], Awaitable[None]]
+BatchHandler = Callable[[AsyncSession, List[OutboxJob]], Awaitable[Dict[int, str]]]
+
+
+def enqueue(db: AsyncSession, tipo: str, payload: dict) -> OutboxJob:
+    """Adicionar um job à outbox na transação corrente (sem commit)."""
+    agora = datetime.now()
+    job = OutboxJob(
+        tipo=tipo,
+        payload=payload,
+        status='pendente',
+        tentativas=0,
+        disponivel_em=agora,
+        criado_em=agora
+    )
+    db.add(job)
+    return job
+
+
+# =====================
+# Handlers
+# =====================
+async def _enviar_convites(db: AsyncSession, job: OutboxJob):
+    p = job.payload
+
+    # Renovar a reserva e terminar antes dela (margem para conectar, reconectar
+    # e um último envio), para que outro worker não pegue o job no meio do envio
+    reserva = settings.outbox_lease_seconds
+    job.disponivel_em = datetime.now() + timedelta(seconds=reserva)
+    await db.commit()
+    prazo = time.monotonic() + max(reserva - 3 * settings.smtp_timeout, reserva / 2)
+
+    entregues = set(p.get("delivered", []))
+    concluidos: List[str] = []
+    try:
+        await email_service.send_meeting_invitations(
+            attendees=[att for att in p["attendees"] if att["email"] not in entregues],
+            meeting_title=p["meeting_title"],
+            meeting_id=p["meeting_id"],
+            meeting_date=datetime.fromisoformat(p["meeting_date"]),
+            meeting_start=p["meeting_start"],
+            meeting_end=p["meeting_end"],
+            room_name=p["room_name"],
+            organizer_name=p["organizer_name"],
+            organizer_email=p["organizer_email"],
+            description=p.get("description"),
+            teams_link=p.get("teams_link"),
+            concluidos=concluidos,
+            prazo=prazo
+        )
+    except Exception:
+        # Gravar os já enviados: a próxima tentativa envia só os restantes
+        if concluidos:
+            job.payload = {**p, "delivered": sorted(entregues.union(concluidos))}
+            await db.commit()
+        raise
+
+
+def _encerrar_teams_cancelada(reuniao: Reuniao):
+    """Status final do Teams para reunião cancelada antes de ter o evento."""
+    if reuniao.teams_status == 'pendente':
+        reuniao.teams_status = 'cancelado'
+        reuniao.atualizado_em = datetime.now()
+
+
+async def _criar_eventos_teams(db: AsyncSession, jobs: List[OutboxJob]) -> Dict[int, str]:
+    """Criar os eventos de vários jobs com um único $batch do Graph."""
+    ids_reunioes = [job.payload["meeting_id"] for job in jobs]
+    result = await db.execute(select(Reuniao).where(Reuniao.id.in_(ids_reunioes)))
+    reunioes = {r.id: r for r in result.scalars()}
+
+    ativos = []
+    for job in jobs:
+        reuniao = reunioes.get(job.payload["meeting_id"])
+        if reuniao is not None and reuniao.status == 'agendada':
+            ativos.append(job)
+        elif reuniao is not None:
+            _encerrar_teams_cancelada(reuniao)
+
+    configurado = graph_service.is_configured
+    resultados: List[Optional[dict]] = [None] * len(ativos)
+    if configurado and ativos:
+        resultados = await graph_service.create_calendar_events([
+            {
+                "subject": job.payload["subject"],
+                "start": datetime.fromisoformat(job.payload["start"]),
+                "end": datetime.fromisoformat(job.payload["end"]),
+                "attendees": job.payload["attendees"],
+                "description": job.payload.get("description")
+            }
+            for job in ativos
+        ])
+
+    # Reler o status com lock: a reunião pode ter sido cancelada durante a
+    # chamada ao Graph (cancel_meeting trava a mesma linha)
+    if ativos:
+        result = await db.execute(
+            select(Reuniao)
+            .where(Reuniao.id.in_([job.payload["meeting_id"] for job in ativos]))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        reunioes = {r.id: r for r in result.scalars()}
+
+    erros: Dict[int, str] = {}
+    for job, resultado in zip(ativos, resultados):
+        reuniao = reunioes.get(job.payload["meeting_id"])
+        if reuniao is None or reuniao.status != 'agendada':
+            # Cancelada no meio: desfazer o evento criado e não enviar convites
+            if reuniao is not None:
+                _encerrar_teams_cancelada(reuniao)
+            if resultado:
+                enqueue(db, TIPO_TEAMS_CANCELAR, {
+                    "meeting_id": job.payload["meeting_id"],
+                    "event_id": resultado["event_id"]
+                })
+            continue
+
+        # Sem resultado: tenta de novo; na última tentativa envia os convites sem link
+        if configurado and resultado is None and job.tentativas + 1 < settings.outbox_max_attempts:
+            erros[job.id] = "Falha ao criar evento no Teams"
+            continue
+
+        teams_link = None
+        if configurado:
+            reuniao.teams_status = 'criado' if resultado else 'falhou'
+        if resultado:
+            teams_link = resultado["join_url"]
+            reuniao.teams_link = teams_link
+            reuniao.teams_event_id = resultado["event_id"]
+        if configurado or resultado:
+            # Mesmo relógio do cursor de GET /api/meetings/changes (o da aplicação)
+            reuniao.atualizado_em = datetime.now()
+
+        if job.payload.get("invitations"):
+            enqueue(db, TIPO_CONVITES, {**job.payload["invitations"], "teams_link": teams_link})
+
+    return erros
+
+
+async def _cancelar_eventos_teams(db: AsyncSession, jobs: List[OutboxJob]) -> Dict[int, str]:
+    """Cancelar os eventos de vários jobs com um único $batch do Graph."""
+    if not graph_service.is_configured:
+        return {}
+
+    resultados = await graph_service.cancel_calendar_events([job.payload["event_id"] for job in jobs])
+    return {
+        job.id: "Falha ao cancelar evento no Teams"
+        for job, ok in zip(jobs, resultados) if not ok
+    }
+
+
+HANDLERS: Dict[str, Handler] = {
+    TIPO_CONVITES: _enviar_convites,
+}
+
+# Handlers em lote: recebem todos os jobs do tipo reivindicados juntos e
+# retornam {job_id: erro} apenas para os itens que falharam
+BATCH_HANDLERS: Dict[str, BatchHandler] = {
+    TIPO_TEAMS_CRIAR: _criar_eventos_teams,
+    TIPO_TEAMS_CANCELAR: _cancelar_eventos_teams,
+}
+
+
+# =====================
+# Worker
+# =====================
+class OutboxWorker:
+    """Pool de workers asyncio que processa a outbox.
+
+    Os jobs são reivindicados em lotes com SELECT ... FOR UPDATE SKIP LOCKED,
+    então vários processos podem consumir a mesma tabela. Um job reivindicado
+    fica reservado por `outbox_lease_seconds`; se o processo morrer, volta a
+    ficar disponível depois disso. Falhas são repetidas com backoff exponencial.
+    """
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._evento = asyncio.Event()
+        self._lock_reivindicacao = asyncio.Lock()
+        self._ultima_limpeza = datetime.min
+        self.processados = 0
+        self.falhas = 0
+        self.descartados = 0
+
+    def notify(self):
+        """Acordar os workers (chamar após o commit que enfileirou jobs)."""
+        self._evento.set()
+
+    async def start(self):
+        self._tasks = [
+            asyncio.create_task(self._loop()) for _ in range(settings.outbox_workers)
+        ]
+        print(f"✅ Outbox iniciada ({settings.outbox_workers} worker(s))")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self):
+        while True:
+            try:
+                jobs = await self._reivindicar()
+                lotes: Dict[str, List[int]] = {}
+                for job_id, tipo in jobs:
+                    if tipo in BATCH_HANDLERS:
+                        lotes.setdefault(tipo, []).append(job_id)
+                    else:
+                        await self._executar(job_id)
+                for tipo, ids in lotes.items():
+                    await self._executar_lote(tipo, ids)
+                await self._limpar_concluidos()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro no worker da outbox: {e}")
+                jobs = []
+
+            if not jobs:
+                self._evento.clear()
+                try:
+                    await asyncio.wait_for(self._evento.wait(), settings.outbox_poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _reivindicar(self) -> List[Tuple[int, str]]:
+        """Reservar um lote de jobs disponíveis.
+        
+        SKIP LOCKED separa os processos; o lock evita que os workers do mesmo
+        processo disputem as mesmas linhas.
+        """
+        async with self._lock_reivindicacao, AsyncSessionLocal() as db:
+            agora = datetime.now()
+            result = await db.execute(
+                select(OutboxJob)
+                .where(
+                    OutboxJob.status.in_(['pendente', 'processando']),
+                    OutboxJob.disponivel_em <= agora
+                )
+                .order_by(OutboxJob.disponivel_em, OutboxJob.id)
+                .limit(settings.outbox_batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            jobs = result.scalars().all()
+
+            for job in jobs:
+                job.status = 'processando'
+                job.disponivel_em = agora + timedelta(seconds=settings.outbox_lease_seconds)
+
+            await db.commit()
+            return [(job.id, job.tipo) for job in jobs]
+
+    async def _executar(self, job_id: int):
+        async with AsyncSessionLocal() as db:
+            job = await db.get(OutboxJob, job_id)
+            if not job or job.status != 'processando':
+                return
+
+            handler = HANDLERS.get(job.tipo)
+            try:
+                if handler is None:
+                    raise RuntimeError(f"Tipo de job desconhecido: {job.tipo}")
+                await handler(db, job)
+                job.status = 'concluido'
+                await db.commit()
+                self.processados += 1
+                return
+            except Exception as e:
+                erro = str(e) or e.__class__.__name__
+                await db.rollback()
+
+            job = await db.get(OutboxJob, job_id)
+            self._registrar_falha(job, erro)
+            await db.commit()
+
+    async def _executar_lote(self, tipo: str, job_ids: List[int]):
+        """Executar um lote de jobs do mesmo tipo com o handler em lote."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxJob).where(
+                    OutboxJob.id.in_(job_ids),
+                    OutboxJob.status == 'processando'
+                )
+            )
+            jobs = result.scalars().all()
+            if not jobs:
+                return
+
+            ids = [job.id for job in jobs]
+            try:
+                erros = await BATCH_HANDLERS[tipo](db, jobs)
+            except Exception as e:
+                erro = str(e) or e.__class__.__name__
+                await db.rollback()
+                result = await db.execute(select(OutboxJob).where(OutboxJob.id.in_(ids)))
+                jobs = result.scalars().all()
+                erros = {job.id: erro for job in jobs}
+
+            for job in jobs:
+                if job.id in erros:
+                    self._registrar_falha(job, erros[job.id])
+                else:
+                    job.status = 'concluido'
+                    self.processados += 1
+            await db.commit()
+
+    def _registrar_falha(self, job: OutboxJob, erro: str):
+        """Registrar a falha e reagendar com backoff exponencial (sem commit)."""
+        job.tentativas += 1
+        job.ultimo_erro = erro
+        self.falhas += 1
+
+        if job.tentativas >= settings.outbox_max_attempts:
+            job.status = 'falhou'
+            self.descartados += 1
+            print(f"❌ Job {job.id} ({job.tipo}) descartado após {job.tentativas} tentativas: {erro}")
+        else:
+            atraso = min(
+                settings.outbox_backoff_base_seconds * 2 ** (job.tentativas - 1),
+                settings.outbox_backoff_max_seconds
+            )
+            job.status = 'pendente'
+            job.disponivel_em = datetime.now() + timedelta(seconds=atraso)
+            print(f"⚠️ Job {job.id} ({job.tipo}) falhou, nova tentativa em {atraso:.0f}s: {erro}")
+
+    async def _limpar_concluidos(self):
+        """Remover jobs concluídos antigos (no máximo uma vez por minuto)."""
+        agora = datetime.now()
+        if agora - self._ultima_limpeza < timedelta(minutes=1):
+            return
+        self._ultima_limpeza = agora
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(OutboxJob).where(
+                    OutboxJob.status == 'concluido',
+                    OutboxJob.atualizado_em < agora - timedelta(days=settings.outbox_retention_days)
+                )
+            )
+            await db.commit()
+
+    async def metrics(self, db: AsyncSession) -> dict:
+        """Profundidade da fila, atraso do job mais antigo e contadores."""
+        result = await db.execute(
+            select(
+                OutboxJob.status,
+                func.count(OutboxJob.id),
+                func.min(OutboxJob.criado_em)
+            ).where(
+                OutboxJob.status.in_(['pendente', 'processando', 'falhou'])
+            ).group_by(OutboxJob.status)
+        )
+        por_status = {status: (total, mais_antigo) for status, total, mais_antigo in result}
+
+        pendentes = [por_status[s] for s in ('pendente', 'processando') if s in por_status]
+        mais_antigo: Optional[datetime] = min((m for _, m in pendentes), default=None)
+
+        return {
+            "depth": sum(total for total, _ in pendentes),
+            "pending": por_status.get('pendente', (0, None))[0],
+            "in_progress": por_status.get('processando', (0, None))[0],
+            "failed": por_status.get('falhou', (0, None))[0],
+            "lag_seconds": (datetime.now() - mais_antigo).total_seconds() if mais_antigo else 0.0,
+            "processed": self.processados,
+            "errors": self.falhas,
+            "dead_lettered": self.descartados
+        }
+
+
+# Singleton instance
+outbox_worker = OutboxWorker()
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import hmac
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+from passlib.context import CryptContext
+from app.config import get_settings
+
+settings = get_settings()
+
+# Hash antigo: SHA-256 sem salt, em hexadecimal
+_SHA256_LEGADO = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PasswordHasher:
+    """Hash de senhas com bcrypt, executado em um pool de threads limitado.
+    
+    O bcrypt é propositalmente lento (~250 ms com custo 12); rodá-lo no event
+    loop travaria todas as outras requisições. O bcrypt libera o GIL, então
+    `workers` threads calculam hashes em paralelo. Hashes SHA-256 legados e
+    hashes com custo menor que o configurado são regravados no login.
+    """
+    
+    def __init__(self, rounds: int = 12, workers: int = 4):
+        self.rounds = rounds
+        self.workers = workers
+        self._contexto = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hash_ficticio: Optional[str] = None
+        self.hashes = 0
+        self.verificacoes = 0
+        self.atualizacoes = 0
+        self.tempo_kdf = 0.0
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kdf")
+        return self._executor
+    
+    async def _executar(self, funcao: Callable, *args):
+        """Rodar a KDF no pool de threads, contabilizando o tempo gasto."""
+        def medir():
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args)
+            finally:
+                self.tempo_kdf += time.perf_counter() - inicio
+        
+        return await asyncio.get_running_loop().run_in_executor(self.executor, medir)
+    
+    @staticmethod
+    def is_legacy(hashed: str) -> bool:
+        return bool(_SHA256_LEGADO.match(hashed or ""))
+    
+    async def hash(self, password: str) -> str:
+        """Gerar o hash bcrypt de uma senha."""
+        self.hashes += 1
+        return await self._executar(self._contexto.hash, password)
+    
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verificar a senha.
+        
+        Retorna (válida, novo_hash). `novo_hash` vem preenchido quando a senha
+        confere mas o hash armazenado deve ser substituído (SHA-256 legado ou
+        custo diferente do configurado).
+        """
+        self.verificacoes += 1
+        
+        if self.is_legacy(hashed):
+            legado = hashlib.sha256(password.encode()).hexdigest()
+            if not hmac.compare_digest(legado, hashed):
+                return False, None
+            self.atualizacoes += 1
+            return True, await self.hash(password)
+        
+        try:
+            valida, novo_hash = await self._executar(self._contexto.verify_and_update, password, hashed)
+        except ValueError:
+            # Hash em formato desconhecido
+            return False, None
+        
+        if novo_hash:
+            self.atualizacoes += 1
+        return valida, novo_hash
+    
+    async def start(self):
+        """Calcular o hash fictício na inicialização, fora do primeiro login."""
+        if self._hash_ficticio is None:
+            self._hash_ficticio = await self._executar(self._contexto.hash, "senha-ficticia")
+    
+    async def verify_dummy(self, password: str) -> Tuple[bool, Optional[str]]:
+        """Verificar contra um hash fixo com o mesmo custo (usuário inexistente).
+        
+        Gasta o mesmo tempo de uma verificação real, para que o tempo de
+        resposta do login não revele quais e-mails têm conta. Sempre inválida.
+        """
+        await self.start()
+        await self.verify(password, self._hash_ficticio)
+        return False, None
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def metrics(self) -> dict:
+        return {
+            "scheme": "bcrypt",
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "hashes": self.hashes,
+            "verifications": self.verificacoes,
+            "upgraded": self.atualizacoes,
+            "kdf_seconds": round(self.tempo_kdf, 3)
+        }
+
+
+# Singleton instance
+password_hasher = PasswordHasher(
+    rounds=settings.password_hash_rounds,
+    workers=settings.password_hash_workers
+)
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, update, delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import AsyncSessionLocal, RefreshToken, Usuario
+
+settings = get_settings()
+
+
+class RefreshTokenService:
+    """Emissão e rotação de refresh tokens.
+    
+    Cada uso troca o token por outro da mesma família. Apresentar um token
+    já usado indica que ele vazou: a família inteira é revogada e o usuário
+    precisa fazer login de novo.
+    
+    Uma varredura periódica (`start`/`stop`) remove os tokens expirados e os
+    usados ou revogados há mais de `refresh_token_retention_days`.
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.removidos = 0
+    
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def issue(self, db: AsyncSession, usuario: Usuario, familia: Optional[str] = None) -> str:
+        """Criar um refresh token na transação corrente (sem commit)."""
+        token = secrets.token_urlsafe(32)
+        agora = datetime.utcnow()
+        db.add(RefreshToken(
+            token_hash=self._hash(token),
+            usuario_id=usuario.id,
+            familia=familia or secrets.token_hex(16),
+            versao=usuario.token_version or 0,
+            expira_em=agora + timedelta(days=settings.refresh_token_expire_days),
+            criado_em=agora
+        ))
+        return token
+    
+    async def rotate(self, db: AsyncSession, token: str) -> Optional[Tuple[Usuario, str]]:
+        """Trocar um refresh token válido por um novo (com commit).
+        
+        Uma única consulta indexada (hash do token + usuário), sem hash de senha.
+        Retorna (usuario, novo_token) ou None se o token for inválido.
+        """
+        result = await db.execute(
+            select(RefreshToken, Usuario)
+            .join(Usuario, Usuario.id == RefreshToken.usuario_id)
+            .where(RefreshToken.token_hash == self._hash(token))
+        )
+        row = result.first()
+        if not row:
+            return None
+        
+        registro, usuario = row
+        agora = datetime.utcnow()
+        
+        if registro.revogado_em is not None:
+            return None
+        if registro.expira_em <= agora or not usuario.ativo or registro.versao < (usuario.token_version or 0):
+            return None
+        
+        # Marcar como usado só se ainda não foi (protege contra usos concorrentes)
+        marcado = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == registro.id, RefreshToken.usado_em.is_(None))
+            .values(usado_em=agora)
+        )
+        if marcado.rowcount != 1:
+            print(f"⚠️ Reuso de refresh token detectado (usuário {usuario.id}), família revogada")
+            await self._revogar_familia(db, registro.familia, agora)
+            await db.commit()
+            return None
+        
+        novo_token = self.issue(db, usuario, registro.familia)
+        await db.commit()
+        return usuario, novo_token
+    
+    async def revoke(self, db: AsyncSession, token: str) -> bool:
+        """Revogar a família do token (logout). Retorna False se não existir."""
+        result = await db.execute(
+            select(RefreshToken.familia).where(RefreshToken.token_hash == self._hash(token))
+        )
+        familia = result.scalar_one_or_none()
+        if familia is None:
+            return False
+        
+        await self._revogar_familia(db, familia, datetime.utcnow())
+        await db.commit()
+        return True
+    
+    async def sweep(self) -> int:
+        """Remover tokens expirados e os usados/revogados fora da retenção."""
+        agora = datetime.utcnow()
+        limite = agora - timedelta(days=settings.refresh_token_retention_days)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(RefreshToken).where(or_(
+                    RefreshToken.expira_em <= agora,
+                    RefreshToken.usado_em < limite,
+                    RefreshToken.revogado_em < limite
+                ))
+            )
+            await db.commit()
+            return result.rowcount
+    
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.refresh_token_sweep_seconds)
+            try:
+                self.removidos += await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro na limpeza de refresh tokens: {e}")
+    
+    async def start(self):
+        self._task = asyncio.create_task(self._loop())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    @staticmethod
+    async def _revogar_familia(db: AsyncSession, familia: str, agora: datetime):
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.familia == familia, RefreshToken.revogado_em.is_(None))
+            .values(revogado_em=agora)
+        )
+
+
+# Singleton instance
+refresh_token_service = RefreshTokenService()
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import time
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from app.config import get_settings
+from app.database import AsyncSessionLocal, Sala, RecursoSala
+
+settings = get_settings()
+
+
+class SalaInfo(NamedTuple):
+    """Sala do catálogo (imutável; mesmos nomes de campo do modelo Sala)."""
+    id: int
+    nome: str
+    capacidade: int
+    cor: str
+    ativa: bool
+    recursos: Tuple[str, ...]
+
+    def to_dict(self) -> dict:
+        """Formato de RoomResponse."""
+        return {
+            "id": self.id,
+            "name": self.nome,
+            "capacity": self.capacidade,
+            "color": self.cor,
+            "resources": list(self.recursos),
+            "is_active": self.ativa
+        }
+
+
+class Catalogo(NamedTuple):
+    """Foto imutável do catálogo: salas por id, ativas por nome e versão."""
+    versao: str
+    por_id: Mapping[int, SalaInfo]
+    ativas: Tuple[SalaInfo, ...]
+
+    def get(self, sala_id: int) -> Optional[SalaInfo]:
+        return self.por_id.get(sala_id)
+
+
+def _versao(salas, recursos) -> str:
+    # Hash do conteúdo lido: muda com qualquer inclusão, remoção ou edição de
+    # sala ou recurso, inclusive feita por SQL direto (sem atualizado_em)
+    return hashlib.sha1(repr((salas, recursos)).encode()).hexdigest()[:16]
+
+
+class RoomCatalog:
+    """Catálogo de salas e recursos em memória.
+
+    Carregado na inicialização (junto com `criar_salas_padrao`) e trocado de
+    forma atômica. Quem altera salas ou recursos chama `bump()`, que invalida
+    o catálogo deste processo; além disso, a cada `room_catalog_ttl_seconds`
+    as tabelas (pequenas) são relidas e o catálogo só é trocado se o hash do
+    conteúdo mudou (vale para alterações feitas por outros processos ou
+    scripts).
+    """
+
+    def __init__(self):
+        self._catalogo: Optional[Catalogo] = None
+        self._verificado_em = 0.0
+        self._sujo = True
+        self._lock = asyncio.Lock()
+        self.recargas = 0
+        self.verificacoes = 0
+
+    @staticmethod
+    async def _ler() -> Tuple[list, list]:
+        """Ler salas e recursos do banco (consultas só de colunas)."""
+        async with AsyncSessionLocal() as db:
+            salas = (await db.execute(
+                select(Sala.id, Sala.nome, Sala.capacidade, Sala.cor, Sala.ativa)
+                .order_by(Sala.nome, Sala.id)
+            )).all()
+            recursos = (await db.execute(
+                select(RecursoSala.sala_id, RecursoSala.nome_recurso).order_by(RecursoSala.id)
+            )).all()
+        return [tuple(s) for s in salas], [tuple(r) for r in recursos]
+
+    def _montar(self, salas: list, recursos: list, versao: str):
+        por_sala = {}
+        for sala_id, nome_recurso in recursos:
+            por_sala.setdefault(sala_id, []).append(nome_recurso)
+
+        # Ordem da consulta (collation do banco) preservada em `ativas`
+        infos = [
+            SalaInfo(sala_id, nome, capacidade, cor, ativa is not False, tuple(por_sala.get(sala_id, ())))
+            for sala_id, nome, capacidade, cor, ativa in salas
+        ]
+        self._catalogo = Catalogo(
+            versao=versao,
+            por_id=MappingProxyType({s.id: s for s in infos}),
+            ativas=tuple(s for s in infos if s.ativa)
+        )
+        self._sujo = False
+        self._verificado_em = time.monotonic()
+        self.recargas += 1
+
+    async def load(self):
+        """(Re)carregar o catálogo do banco."""
+        salas, recursos = await self._ler()
+        self._montar(salas, recursos, _versao(salas, recursos))
+
+    def bump(self):
+        """Invalidar o catálogo (chamar após alterar salas ou recursos)."""
+        self._sujo = True
+
+    async def _verificar(self):
+        """TTL expirado: reler e só trocar o catálogo se a versão mudou."""
+        salas, recursos = await self._ler()
+        versao = _versao(salas, recursos)
+        self.verificacoes += 1
+        if versao != self._catalogo.versao:
+            self._montar(salas, recursos, versao)
+        else:
+            self._verificado_em = time.monotonic()
+
+    def _expirado(self) -> bool:
+        return time.monotonic() - self._verificado_em >= settings.room_catalog_ttl_seconds
+
+    async def snapshot(self) -> Catalogo:
+        """Catálogo atual; recarrega/confere antes se necessário."""
+        if self._catalogo is not None and not self._sujo and not self._expirado():
+            return self._catalogo
+
+        async with self._lock:
+            try:
+                if self._catalogo is None or self._sujo:
+                    await self.load()
+                elif self._expirado():
+                    await self._verificar()
+            except Exception as e:
+                if self._catalogo is None:
+                    raise
+                # Banco indisponível: seguir com o catálogo anterior
+                self._verificado_em = time.monotonic()
+                print(f"⚠️ Erro ao atualizar catálogo de salas: {e}")
+        return self._catalogo
+
+    def metrics(self) -> dict:
+        catalogo = self._catalogo
+        return {
+            "version": catalogo.versao if catalogo else None,
+            "rooms": len(catalogo.por_id) if catalogo else 0,
+            "active_rooms": len(catalogo.ativas) if catalogo else 0,
+            "reloads": self.recargas,
+            "version_checks": self.verificacoes
+        }
+
+
+# Singleton instance
+room_catalog = RoomCatalog()
@@ -0,0 +1,67 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+import time
+from datetime import datetime
+from typing import Optional
+from app.config import get_settings
+
+settings = get_settings()
+
+# participante_id (8 bytes) + expiração em epoch (4 bytes)
+_FORMATO = ">QI"
+_TAMANHO_CORPO = struct.calcsize(_FORMATO)
+_TAMANHO_ASSINATURA = 16
+
+
+def _b64(dados: bytes) -> str:
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode()
+
+
+def _unb64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+class RsvpTokenSigner:
+    """Tokens de convite assinados (HMAC-SHA256), verificados sem consultar o banco.
+    
+    Formato: base64url(participante_id + expiração) "." base64url(HMAC truncado).
+    Não há estado no servidor; o uso único é garantido pelo status do
+    participante (só 'pendente' pode responder).
+    """
+    
+    def __init__(self, secret: str):
+        self._chave = secret.encode()
+    
+    def _assinar(self, corpo: bytes) -> bytes:
+        return hmac.new(self._chave, b"rsvp:" + corpo, hashlib.sha256).digest()[:_TAMANHO_ASSINATURA]
+    
+    def sign(self, participante_id: int, expira_em: datetime) -> str:
+        corpo = struct.pack(_FORMATO, participante_id, int(expira_em.timestamp()))
+        return f"{_b64(corpo)}.{_b64(self._assinar(corpo))}"
+    
+    def verify(self, token: str) -> Optional[int]:
+        """Retornar o participante_id de um token válido, ou None."""
+        corpo_b64, separador, assinatura_b64 = token.partition(".")
+        if not separador:
+            return None
+        
+        try:
+            corpo = _unb64(corpo_b64)
+            assinatura = _unb64(assinatura_b64)
+        except (ValueError, binascii.Error):
+            return None
+        
+        if len(corpo) != _TAMANHO_CORPO or not hmac.compare_digest(assinatura, self._assinar(corpo)):
+            return None
+        
+        participante_id, expira_em = struct.unpack(_FORMATO, corpo)
+        if expira_em < time.time():
+            return None
+        return participante_id
+
+
+# Singleton instance
+rsvp_tokens = RsvpTokenSigner(settings.rsvp_token_secret or settings.jwt_secret_key)
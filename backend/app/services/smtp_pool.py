@@ -0,0 +1,118 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import List, Optional, Sequence, Tuple, Union
+import aiosmtplib
+
+
+class SMTPPool:
+    """Pool limitado de conexões SMTP assíncronas, autenticadas e reutilizáveis."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        start_tls: bool = True,
+        size: int = 4,
+        timeout: float = 30.0,
+        keepalive_seconds: float = 60.0
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.start_tls = start_tls
+        self.size = size
+        self.timeout = timeout
+        self.keepalive_seconds = keepalive_seconds
+
+        self._semaforo = asyncio.Semaphore(size)
+        # Conexões ociosas com o instante em que foram devolvidas
+        self._ociosas: List[Tuple[aiosmtplib.SMTP, float]] = []
+
+    async def _conectar(self) -> aiosmtplib.SMTP:
+        """Abrir uma nova conexão (STARTTLS/TLS e login quando configurados)."""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.user or None,
+            password=self.password or None,
+            use_tls=self.port == 465,
+            start_tls=self.start_tls if self.port != 465 else False,
+            timeout=self.timeout
+        )
+        await smtp.connect()
+        return smtp
+
+    @staticmethod
+    async def _descartar(smtp: aiosmtplib.SMTP):
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _obter(self, nova: bool = False) -> aiosmtplib.SMTP:
+        """Reutilizar uma conexão ociosa ainda válida ou abrir outra."""
+        while self._ociosas and not nova:
+            smtp, devolvida_em = self._ociosas.pop()
+            if smtp.is_connected and time.monotonic() - devolvida_em < self.keepalive_seconds:
+                return smtp
+            await self._descartar(smtp)
+        return await self._conectar()
+
+    @asynccontextmanager
+    async def connection(self, nova: bool = False):
+        """Emprestar uma conexão do pool (bloqueia se todas estiverem em uso)."""
+        async with self._semaforo:
+            smtp = await self._obter(nova)
+            try:
+                yield smtp
+            except BaseException:
+                await self._descartar(smtp)
+                raise
+            else:
+                self._ociosas.append((smtp, time.monotonic()))
+
+    async def send(
+        self,
+        msg: Union[Message, bytes],
+        sender: Optional[str] = None,
+        recipients: Optional[Sequence[str]] = None
+    ):
+        """Enviar uma mensagem, reconectando uma vez se a conexão caiu."""
+        for tentativa in range(2):
+            try:
+                async with self.connection(nova=tentativa > 0) as smtp:
+                    await self.send_with(smtp, msg, sender, recipients)
+                return
+            except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                if tentativa == 1:
+                    raise
+
+    async def send_with(
+        self,
+        smtp: aiosmtplib.SMTP,
+        msg: Union[Message, bytes],
+        sender: Optional[str] = None,
+        recipients: Optional[Sequence[str]] = None
+    ):
+        """Enviar por uma conexão já emprestada, com timeout por envio.
+
+        `msg` pode ser uma Message ou a mensagem já serializada (bytes); neste
+        caso `sender` e `recipients` são obrigatórios.
+        """
+        if isinstance(msg, bytes):
+            envio = smtp.sendmail(sender, recipients, msg)
+        else:
+            envio = smtp.send_message(msg, sender=sender, recipients=recipients)
+        await asyncio.wait_for(envio, self.timeout)
+
+    async def close(self):
+        """Encerrar todas as conexões ociosas."""
+        ociosas, self._ociosas = self._ociosas, []
+        for smtp, _ in ociosas:
+            await self._descartar(smtp)
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import Dict, Optional, Set
+from sqlalchemy import select, or_
+from app.config import get_settings
+from app.database import AsyncSessionLocal, Usuario
+
+settings = get_settings()
+
+
+class TokenRevocation:
+    """Registro de revogação para o modo de autenticação por claims.
+
+    Em vez de consultar o usuário a cada requisição, guarda apenas as exceções:
+    usuários inativos e usuários cuja `token_version` já foi incrementada
+    (ex.: senha redefinida). Tokens com versão menor que a registrada são
+    rejeitados. O registro é recarregado do banco periodicamente, então
+    alterações feitas por outros processos valem em até
+    `token_revocation_refresh_seconds`.
+    """
+
+    def __init__(self):
+        self._versoes: Dict[int, int] = {}
+        self._inativos: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._carregado_em: Optional[float] = None
+        self.recargas = 0
+        self.rejeitados = 0
+
+    def is_revoked(self, user_id: int, versao: int) -> bool:
+        """Verificar se o token (usuário + versão) foi revogado."""
+        if user_id in self._inativos or versao < self._versoes.get(user_id, 0):
+            self.rejeitados += 1
+            return True
+        return False
+
+    def bump(self, user_id: int, versao: int):
+        """Registrar localmente uma nova versão (após o commit no banco)."""
+        self._versoes[user_id] = max(versao, self._versoes.get(user_id, 0))
+
+    async def load(self):
+        """Recarregar as exceções do banco e trocar o registro de uma vez."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Usuario.id, Usuario.token_version, Usuario.ativo).where(
+                    or_(Usuario.token_version > 0, Usuario.ativo == False)  # noqa: E712
+                )
+            )
+            versoes: Dict[int, int] = {}
+            inativos: Set[int] = set()
+            for user_id, versao, ativo in result:
+                if versao:
+                    versoes[user_id] = versao
+                if not ativo:
+                    inativos.add(user_id)
+
+        # Versões só crescem: preservar incrementos locais feitos durante a leitura
+        for user_id, versao in self._versoes.items():
+            if versao > versoes.get(user_id, 0):
+                versoes[user_id] = versao
+
+        self._versoes, self._inativos = versoes, inativos
+        self._carregado_em = time.time()
+        self.recargas += 1
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.token_revocation_refresh_seconds)
+            try:
+                await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro ao recarregar revogações de token: {e}")
+
+    async def start(self):
+        await self.load()
+        self._task = asyncio.create_task(self._loop())
+        print(f"✅ Autenticação por claims ativa ({len(self._versoes)} versão(ões), "
+              f"{len(self._inativos)} inativo(s))")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            "bumped_users": len(self._versoes),
+            "inactive_users": len(self._inativos),
+            "reloads": self.recargas,
+            "rejected": self.rejeitados,
+            "loaded_seconds_ago": round(time.time() - self._carregado_em, 1) if self._carregado_em else None
+        }
+
+
+# Singleton instance
+token_revocation = TokenRevocation()
@@ -0,0 +1,166 @@
+import asyncio
+from abc import ABC, abstractmethod
+import hashlib
+import heapq
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, delete
+from app.config import get_settings
+from app.database import AsyncSessionLocal, TokenTemporario
+
+settings = get_settings()
+
+
+class TokenStore(ABC):
+    """Armazenamento de tokens de uso único com validade.
+    
+    Os tokens são guardados apenas como hash SHA-256 (busca por igualdade em
+    índice único). Tokens expirados nunca são retornados e são removidos em
+    lote por uma varredura periódica (`start`/`stop`).
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.removidos = 0
+    
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    @abstractmethod
+    async def put(self, tipo: str, token: str, dados: dict, ttl_seconds: float):
+        """Guardar `dados` associados ao token por `ttl_seconds`."""
+    
+    @abstractmethod
+    async def get(self, tipo: str, token: str) -> Optional[dict]:
+        """Ler os dados de um token válido sem consumi-lo."""
+    
+    @abstractmethod
+    async def consume(self, tipo: str, token: str) -> Optional[dict]:
+        """Ler e remover um token válido (só um chamador consegue consumir)."""
+    
+    @abstractmethod
+    async def sweep(self) -> int:
+        """Remover tokens expirados. Retorna quantos foram removidos."""
+    
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.token_store_sweep_seconds)
+            try:
+                self.removidos += await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro na limpeza de tokens expirados: {e}")
+    
+    async def start(self):
+        self._task = asyncio.create_task(self._loop())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class MemoryTokenStore(TokenStore):
+    """Backend em memória (um único processo). Um heap por validade permite
+    remover os expirados sem percorrer todos os tokens."""
+    
+    def __init__(self):
+        super().__init__()
+        self._tokens: Dict[str, Tuple[str, dict, float]] = {}
+        self._expiracoes: List[Tuple[float, str]] = []
+    
+    def _valido(self, tipo: str, token: str) -> Optional[str]:
+        chave = self._hash(token)
+        item = self._tokens.get(chave)
+        if item is None or item[0] != tipo or item[2] <= time.time():
+            return None
+        return chave
+    
+    async def put(self, tipo: str, token: str, dados: dict, ttl_seconds: float):
+        chave = self._hash(token)
+        expira_em = time.time() + ttl_seconds
+        self._tokens[chave] = (tipo, dados, expira_em)
+        heapq.heappush(self._expiracoes, (expira_em, chave))
+    
+    async def get(self, tipo: str, token: str) -> Optional[dict]:
+        chave = self._valido(tipo, token)
+        return self._tokens[chave][1] if chave else None
+    
+    async def consume(self, tipo: str, token: str) -> Optional[dict]:
+        chave = self._valido(tipo, token)
+        return self._tokens.pop(chave)[1] if chave else None
+    
+    async def sweep(self) -> int:
+        agora = time.time()
+        removidos = 0
+        while self._expiracoes and self._expiracoes[0][0] <= agora:
+            expira_em, chave = heapq.heappop(self._expiracoes)
+            item = self._tokens.get(chave)
+            # Ignorar entradas já consumidas ou regravadas com outra validade
+            if item is not None and item[2] == expira_em:
+                del self._tokens[chave]
+                removidos += 1
+        return removidos
+
+
+class DatabaseTokenStore(TokenStore):
+    """Backend MySQL (tabela tokens_temporarios), compartilhado entre workers."""
+    
+    async def put(self, tipo: str, token: str, dados: dict, ttl_seconds: float):
+        agora = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            db.add(TokenTemporario(
+                token_hash=self._hash(token),
+                tipo=tipo,
+                dados=dados,
+                expira_em=agora + timedelta(seconds=ttl_seconds),
+                criado_em=agora
+            ))
+            await db.commit()
+    
+    @staticmethod
+    def _consulta(tipo: str, chave: str):
+        return select(TokenTemporario.id, TokenTemporario.dados).where(
+            TokenTemporario.token_hash == chave,
+            TokenTemporario.tipo == tipo,
+            TokenTemporario.expira_em > datetime.utcnow()
+        )
+    
+    async def get(self, tipo: str, token: str) -> Optional[dict]:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(self._consulta(tipo, self._hash(token)))).first()
+            return row.dados if row else None
+    
+    async def consume(self, tipo: str, token: str) -> Optional[dict]:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(self._consulta(tipo, self._hash(token)))).first()
+            if not row:
+                return None
+            # O DELETE decide quem consome quando há requisições concorrentes
+            result = await db.execute(delete(TokenTemporario).where(TokenTemporario.id == row.id))
+            await db.commit()
+            return row.dados if result.rowcount == 1 else None
+    
+    async def sweep(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(TokenTemporario).where(TokenTemporario.expira_em <= datetime.utcnow())
+            )
+            await db.commit()
+            return result.rowcount
+
+
+def criar_token_store(backend: str) -> TokenStore:
+    if backend == "memory":
+        return MemoryTokenStore()
+    if backend == "database":
+        return DatabaseTokenStore()
+    raise ValueError(f"token_store_backend inválido: {backend}")
+
+
+# Singleton instance
+token_store = criar_token_store(settings.token_store_backend)
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.config import get_settings
+from app.database import Usuario
+
+settings = get_settings()
+
+
+class UserCache:
+    """Cache LRU com TTL dos usuários autenticados, indexado pelo `sub` do JWT.
+
+    Guarda cópias desanexadas da sessão (sem o hash da senha), para que as
+    requisições não compartilhem instâncias do ORM. Deve ser invalidado
+    sempre que um usuário for desativado ou tiver a senha alterada; o TTL
+    limita a defasagem para alterações feitas fora da API.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._itens: "OrderedDict[str, Tuple[Usuario, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _copiar(usuario: Usuario) -> Usuario:
+        return Usuario(
+            id=usuario.id,
+            email=usuario.email,
+            nome=usuario.nome,
+            ativo=usuario.ativo,
+            token_version=usuario.token_version,
+            criado_em=usuario.criado_em
+        )
+
+    def get(self, sub: str) -> Optional[Usuario]:
+        item = self._itens.get(sub)
+        if item is None:
+            self.misses += 1
+            return None
+
+        usuario, expira_em = item
+        if time.monotonic() >= expira_em:
+            del self._itens[sub]
+            self.misses += 1
+            return None
+
+        self._itens.move_to_end(sub)
+        self.hits += 1
+        return usuario
+
+    def put(self, sub: str, usuario: Usuario) -> Usuario:
+        """Armazenar o usuário e retornar a cópia guardada."""
+        copia = self._copiar(usuario)
+        self._itens[sub] = (copia, time.monotonic() + self.ttl_seconds)
+        self._itens.move_to_end(sub)
+        while len(self._itens) > self.max_size:
+            self._itens.popitem(last=False)
+            self.evictions += 1
+        return copia
+
+    def invalidate(self, user_id: int):
+        self._itens.pop(str(user_id), None)
+
+    def clear(self):
+        self._itens.clear()
+
+    def metrics(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._itens),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+# Singleton instance
+user_cache = UserCache(
+    max_size=settings.user_cache_size,
+    ttl_seconds=settings.user_cache_ttl_seconds
+)
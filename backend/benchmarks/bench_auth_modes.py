@@ -0,0 +1,110 @@
+"""Benchmark de requisições por segundo por modo de autenticação.
+
+Chama /api/auth/me e /api/meetings/calendar pelo app FastAPI (transporte
+ASGI, sem rede) em três configurações:
+
+- database: busca o usuário no banco a cada requisição (sem cache)
+- database + cache: busca no banco só na falta do cache de usuários
+- claims: usuário montado a partir do JWT, revogação em memória
+
+Por padrão usa SQLite em memória, onde cada consulta custa bem menos que um
+round trip ao MySQL; defina BENCH_DATABASE_URL para medir contra o MySQL.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_auth_modes
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+import httpx
+from app.config import get_settings
+from app.database import get_db, Usuario, Sala, Reuniao
+from app.main import app
+from app.services.auth_service import auth_service
+from app.services.user_cache import user_cache
+from benchmarks.common import criar_engine_benchmark, usar_catalogo_de_salas, ContadorQueries
+
+settings = get_settings()
+
+REQUISICOES = 2000
+CONCORRENCIA = 20
+REUNIOES = 20
+INICIO = datetime(2026, 1, 5, 8, 0)
+
+MODOS = [
+    ("database", "database", False),
+    ("database + cache", "database", True),
+    ("claims", "claims", True),
+]
+
+
+async def popular(session_factory) -> str:
+    async with session_factory() as db:
+        usuario = Usuario(email="bench@example.com", nome="Bench", senha_hash="x")
+        sala = Sala(nome="Sala Bench", capacidade=8, cor="#6366F1")
+        db.add_all([usuario, sala])
+        await db.flush()
+        for i in range(REUNIOES):
+            inicio = INICIO + timedelta(days=i // 8, hours=i % 8)
+            db.add(Reuniao(
+                titulo=f"Reunião {i}", sala_id=sala.id, organizador_id=usuario.id,
+                data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(minutes=45),
+                status='agendada'
+            ))
+        await db.commit()
+        return auth_service.create_jwt_token(usuario)
+
+
+async def medir(client: httpx.AsyncClient, url: str, params: dict = None) -> float:
+    semaforo = asyncio.Semaphore(CONCORRENCIA)
+
+    async def chamada():
+        async with semaforo:
+            response = await client.get(url, params=params)
+            assert response.status_code == 200, response.text
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(chamada() for _ in range(REQUISICOES)))
+    return REQUISICOES / (time.perf_counter() - inicio)
+
+
+async def main():
+    engine, session_factory = await criar_engine_benchmark()
+
+    async def _get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    token = await popular(session_factory)
+    await usar_catalogo_de_salas(session_factory)
+    contador = ContadorQueries(engine)
+    periodo = {"start": INICIO.isoformat(), "end": (INICIO + timedelta(days=7)).isoformat()}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        for nome, modo, cache in MODOS:
+            settings.auth_mode = modo
+            settings.user_cache_enabled = cache
+            user_cache.clear()
+
+            # Consultas por requisição já aquecida (cache preenchido)
+            await client.get("/api/auth/me")
+            with contador.medir():
+                await client.get("/api/auth/me")
+            sql_me = contador.total
+
+            rps_me = await medir(client, "/api/auth/me")
+            rps_cal = await medir(client, "/api/meetings/calendar", periodo)
+            print(f"{nome:<17} | /me {rps_me:>7.0f} req/s ({sql_me} SQL) "
+                  f"| /calendar {rps_cal:>7.0f} req/s")
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
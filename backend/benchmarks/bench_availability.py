@@ -0,0 +1,95 @@
+"""Benchmark do motor de disponibilidade de salas.
+
+Compara o loop antigo (uma consulta de conflito por sala) com o
+AvailabilityService atual, com 10, 100 e 1000 salas: um SELECT DISTINCT das
+salas ocupadas no intervalo, filtrando as salas ativas do catálogo em
+memória (carregado antes da medição, como no init_db).
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_availability
+"""
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.database import Sala, RecursoSala, Reuniao, Usuario
+from app.services.availability_service import availability_service
+from benchmarks.common import criar_engine_benchmark, usar_catalogo_de_salas, ContadorQueries, cronometro
+
+TAMANHOS = [10, 100, 1000]
+INICIO = datetime(2026, 1, 5, 10, 0)
+FIM = INICIO + timedelta(hours=1)
+
+
+async def popular(session_factory, total_salas: int):
+    """Criar salas com recursos e ocupar metade delas no horário testado."""
+    async with session_factory() as db:
+        usuario = Usuario(email="bench@example.com", nome="Bench", senha_hash="x")
+        db.add(usuario)
+        await db.flush()
+
+        for i in range(total_salas):
+            sala = Sala(nome=f"Sala {i:04d}", capacidade=4 + i % 10, cor="#3b82f6")
+            db.add(sala)
+            await db.flush()
+            db.add(RecursoSala(sala_id=sala.id, nome_recurso="TV"))
+            if i % 3 == 0:
+                db.add(RecursoSala(sala_id=sala.id, nome_recurso="Webcam"))
+            if i % 2 == 0:
+                db.add(Reuniao(
+                    titulo=f"Reunião {i}",
+                    sala_id=sala.id,
+                    organizador_id=usuario.id,
+                    data_hora_inicio=INICIO,
+                    data_hora_fim=FIM,
+                    status='agendada'
+                ))
+
+        await db.commit()
+
+
+async def loop_por_sala(db):
+    """Implementação anterior: uma consulta por sala ativa."""
+    result = await db.execute(
+        select(Sala).options(selectinload(Sala.recursos)).where(Sala.ativa == True)
+    )
+    livres = []
+    for r in result.scalars().all():
+        conflito = await db.execute(
+            select(Reuniao).where(
+                Reuniao.sala_id == r.id,
+                Reuniao.status == 'agendada',
+                Reuniao.data_hora_inicio < FIM,
+                Reuniao.data_hora_fim > INICIO
+            )
+        )
+        if conflito.scalar_one_or_none() is None:
+            livres.append({"id": r.id, "resources": [rec.nome_recurso for rec in r.recursos]})
+    return livres
+
+
+async def main():
+    print(f"{'salas':>6} | {'modo':<20} | {'queries':>7} | {'tempo (ms)':>10} | {'livres':>6}")
+    print("-" * 63)
+
+    for total in TAMANHOS:
+        engine, session_factory = await criar_engine_benchmark()
+        await popular(session_factory, total)
+        await usar_catalogo_de_salas(session_factory)
+        contador = ContadorQueries(engine)
+
+        async with session_factory() as db:
+            with contador.medir(), cronometro() as tempo:
+                livres = await loop_por_sala(db)
+            print(f"{total:>6} | {'loop por sala':<20} | {contador.total:>7} | {tempo['ms']:>10.1f} | {len(livres):>6}")
+
+        async with session_factory() as db:
+            with contador.medir(), cronometro() as tempo:
+                livres = await availability_service.get_available_rooms(db, INICIO, FIM)
+            print(f"{total:>6} | {'distinct + catálogo':<20} | {contador.total:>7} | {tempo['ms']:>10.1f} | {len(livres):>6}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""Benchmark do calendário: entidades ORM + selectinload x projeção de colunas.
+
+Popula 50.000 reuniões em um mês e gera a resposta (bytes) de
+GET /api/meetings/calendar para o período inteiro de duas formas:
+
+- antes: select(Reuniao) + selectinload(sala, organizador) (3 statements,
+  objetos no identity map), serializado como o FastAPI fazia
+  (jsonable_encoder + JSONResponse)
+- depois: a rota atual (só as colunas usadas, salas do catálogo em memória, FastJSONResponse)
+
+Mede linhas por segundo, statements SQL e pico de memória (tracemalloc).
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_calendar_projection
+"""
+import asyncio
+import time
+import tracemalloc
+import orjson
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+from starlette.requests import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.database import Reuniao, Sala, Usuario
+from app.routes.meetings import get_calendar_events
+from benchmarks.common import criar_engine_benchmark, usar_catalogo_de_salas, ContadorQueries
+
+TOTAL_REUNIOES = 50_000
+TOTAL_SALAS = 50
+TOTAL_USUARIOS = 500
+INICIO = datetime(2026, 3, 1)
+FIM = datetime(2026, 3, 31, 23, 59)
+
+
+async def popular(session_factory):
+    async with session_factory() as db:
+        await db.execute(insert(Usuario), [
+            {"id": i, "email": f"u{i}@example.com", "nome": f"Usuário {i}", "senha_hash": "x"}
+            for i in range(1, TOTAL_USUARIOS + 1)
+        ])
+        await db.execute(insert(Sala), [
+            {"id": i, "nome": f"Sala {i}", "capacidade": 8, "cor": "#6366F1"}
+            for i in range(1, TOTAL_SALAS + 1)
+        ])
+        await db.execute(insert(Reuniao), [
+            {
+                "titulo": f"Reunião {i}",
+                "sala_id": i % TOTAL_SALAS + 1,
+                "organizador_id": i % TOTAL_USUARIOS + 1,
+                "data_hora_inicio": INICIO + timedelta(minutes=(i * 37) % (30 * 24 * 60)),
+                "data_hora_fim": INICIO + timedelta(minutes=(i * 37) % (30 * 24 * 60) + 60),
+                "status": "agendada",
+                "teams_link": None
+            }
+            for i in range(TOTAL_REUNIOES)
+        ])
+        await db.commit()
+
+
+async def antes(db, usuario):
+    """Implementação anterior de get_calendar_events."""
+    result = await db.execute(
+        select(Reuniao).options(
+            selectinload(Reuniao.sala),
+            selectinload(Reuniao.organizador)
+        ).where(
+            Reuniao.status == 'agendada',
+            Reuniao.data_hora_inicio >= INICIO,
+            Reuniao.data_hora_inicio <= FIM
+        ).order_by(Reuniao.data_hora_inicio)
+    )
+    reunioes = result.scalars().all()
+    return JSONResponse(jsonable_encoder([
+        {
+            "id": r.id,
+            "title": r.titulo,
+            "start": r.data_hora_inicio.isoformat(),
+            "end": r.data_hora_fim.isoformat(),
+            "room_id": r.sala_id,
+            "room_name": r.sala.nome if r.sala else "Sala",
+            "room_color": r.sala.cor if r.sala else "#6366F1",
+            "organizer_name": r.organizador.nome if r.organizador else "Organizador",
+            "is_own_meeting": r.organizador_id == usuario.id,
+            "teams_link": r.teams_link
+        }
+        for r in reunioes
+    ]))
+
+
+async def depois(db, usuario):
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    return await get_calendar_events(request, INICIO.isoformat(), FIM.isoformat(), usuario, db)
+
+
+async def rodar(nome: str, session_factory, contador: ContadorQueries, usuario, montar):
+    # Tempo (sem tracemalloc, que deixa tudo mais lento)
+    async with session_factory() as db:
+        with contador.medir():
+            inicio = time.perf_counter()
+            resposta = await montar(db, usuario)
+            duracao = time.perf_counter() - inicio
+    eventos = orjson.loads(resposta.body)
+
+    # Pico de memória em uma sessão nova
+    async with session_factory() as db:
+        tracemalloc.start()
+        await montar(db, usuario)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"{nome:<26} | {len(eventos):>6} eventos | SQL {contador.total} "
+          f"| {duracao * 1000:>7.1f} ms | {len(eventos) / duracao:>9,.0f} linhas/s "
+          f"| pico {pico / 1024 / 1024:>6.1f} MiB")
+
+
+async def main():
+    engine, session_factory = await criar_engine_benchmark()
+    await popular(session_factory)
+    await usar_catalogo_de_salas(session_factory)
+    contador = ContadorQueries(engine)
+    usuario = Usuario(id=1, email="u1@example.com", nome="Usuário 1")
+
+    await rodar("antes (ORM + selectinload)", session_factory, contador, usuario, antes)
+    await rodar("depois (colunas + catálogo)", session_factory, contador, usuario, depois)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
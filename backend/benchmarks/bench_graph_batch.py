@@ -0,0 +1,87 @@
+"""Benchmark de operações em massa no Graph: uma requisição por evento x $batch.
+
+Sobe um Graph falso local (com latência por requisição) e cria e depois
+cancela EVENTOS eventos de duas formas:
+
+- individual: create_calendar_event / cancel_calendar_event em sequência,
+  como a outbox fazia job a job
+- em lote: create_calendar_events / cancel_calendar_events ($batch de 20)
+
+Alguns eventos são recusados pelo servidor para mostrar as falhas por item.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_graph_batch
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+PORTA = 8032
+EVENTOS = 100
+FALHAS = 5
+LATENCIA = 0.02  # segundos por requisição
+
+os.environ.update({
+    "AZURE_CLIENT_ID": "bench",
+    "AZURE_TENANT_ID": "bench",
+    "AZURE_CLIENT_SECRET": "bench",
+    "AZURE_ORGANIZER_EMAIL": "agenda@example.com",
+    "AZURE_LOGIN_BASE": f"http://127.0.0.1:{PORTA}",
+    "GRAPH_API_BASE": f"http://127.0.0.1:{PORTA}",
+})
+
+from app.services.graph_service import GraphService  # noqa: E402
+from benchmarks.fake_graph import ASSUNTO_FALHA, FakeGraphServer  # noqa: E402
+
+INICIO = datetime(2026, 1, 5, 8, 0)
+
+
+def eventos() -> list:
+    return [
+        {
+            "subject": f"Reunião {i}" + (f" {ASSUNTO_FALHA}" if i < FALHAS else ""),
+            "start": INICIO + timedelta(hours=i),
+            "end": INICIO + timedelta(hours=i, minutes=30),
+            "attendees": [f"p{i}@example.com"]
+        }
+        for i in range(EVENTOS)
+    ]
+
+
+async def rodar(nome: str, servidor: FakeGraphServer, criar, cancelar):
+    servidor.app.state.requisicoes = 0
+    inicio = time.perf_counter()
+    criados = await criar(eventos())
+    tempo_criar = time.perf_counter() - inicio
+
+    ids = [c["event_id"] for c in criados if c]
+    inicio = time.perf_counter()
+    cancelados = await cancelar(ids)
+    tempo_cancelar = time.perf_counter() - inicio
+
+    print(f"{nome:<10} | criar {tempo_criar * 1000:>7.1f} ms ({len(ids)} ok) "
+          f"| cancelar {tempo_cancelar * 1000:>7.1f} ms ({sum(cancelados)} ok) "
+          f"| requisições HTTP {servidor.app.state.requisicoes:>4}")
+
+
+async def main():
+    with FakeGraphServer(PORTA, latencia=LATENCIA) as servidor:
+        service = GraphService()
+        await service.start()
+        while service._access_token is None:
+            await asyncio.sleep(0.01)
+
+        async def criar_individual(lista):
+            return [await service.create_calendar_event(**e) for e in lista]
+
+        async def cancelar_individual(ids):
+            return [await service.cancel_calendar_event(event_id) for event_id in ids]
+
+        await rodar("individual", servidor, criar_individual, cancelar_individual)
+        await rodar("em lote", servidor, service.create_calendar_events, service.cancel_calendar_events)
+        await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Benchmark de latência por chamada ao Graph com e sem reuso de conexão.
+
+Sobe um Graph falso local e cria eventos em sequência de duas formas:
+
+- sem reuso: um httpx.AsyncClient novo por chamada (comportamento anterior)
+- com reuso: o AsyncClient compartilhado do GraphService
+
+O servidor local é HTTP puro; contra o Graph real a diferença é maior, pois
+cada conexão nova também paga DNS e handshake TLS.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_graph_pool
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+PORTA = 8030
+CHAMADAS = 300
+
+os.environ.update({
+    "AZURE_CLIENT_ID": "bench",
+    "AZURE_TENANT_ID": "bench",
+    "AZURE_CLIENT_SECRET": "bench",
+    "AZURE_ORGANIZER_EMAIL": "agenda@example.com",
+    "AZURE_LOGIN_BASE": f"http://127.0.0.1:{PORTA}",
+    "GRAPH_API_BASE": f"http://127.0.0.1:{PORTA}",
+})
+
+import httpx  # noqa: E402
+from app.services.graph_service import GraphService  # noqa: E402
+from benchmarks.fake_graph import FakeGraphServer  # noqa: E402
+
+INICIO = datetime(2026, 1, 5, 10, 0)
+EVENTO = {"subject": "Bench", "start": INICIO, "end": INICIO + timedelta(hours=1)}
+
+
+def resumo(nome: str, latencias: list):
+    latencias.sort()
+    media = sum(latencias) / len(latencias)
+    p50 = latencias[len(latencias) // 2]
+    p99 = latencias[int(len(latencias) * 0.99)]
+    print(f"{nome:<12} | média {media:>6.2f} ms | p50 {p50:>6.2f} ms | p99 {p99:>6.2f} ms")
+
+
+async def sem_reuso(service: GraphService, url: str) -> list:
+    """Mesma requisição do create_calendar_event, com um cliente por chamada."""
+    token = await service._get_access_token()
+    latencias = []
+    for _ in range(CHAMADAS):
+        t0 = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{url}/users/agenda@example.com/events",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"subject": EVENTO["subject"]},
+                timeout=30.0
+            )
+            response.json()
+        latencias.append((time.perf_counter() - t0) * 1000)
+    return latencias
+
+
+async def com_reuso(service: GraphService) -> list:
+    latencias = []
+    for _ in range(CHAMADAS):
+        t0 = time.perf_counter()
+        await service.create_calendar_event(**EVENTO)
+        latencias.append((time.perf_counter() - t0) * 1000)
+    return latencias
+
+
+async def main():
+    with FakeGraphServer(PORTA) as servidor:
+        service = GraphService()
+        await service.start()
+        # Aquecimento (token em cache e primeira conexão)
+        await service.create_calendar_event(**EVENTO)
+
+        resumo("sem reuso", await sem_reuso(service, servidor.url))
+        resumo("com reuso", await com_reuso(service))
+        await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""Benchmark da renovação do token do Graph sob concorrência.
+
+Sobe um Graph falso local (com latência no endpoint de token) e dispara
+CHAMADAS requisições concorrentes no instante em que o token expira:
+
+- antes: cada chamada busca o próprio token (comportamento anterior)
+- single-flight: as chamadas compartilham uma única busca
+- renovação proativa: o token é renovado antes de expirar; ninguém espera
+
+Mede buscas de token feitas ao servidor e o tempo de espera das requisições.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_graph_token
+"""
+import asyncio
+import os
+import time
+
+PORTA = 8031
+CHAMADAS = 200
+LATENCIA_TOKEN = 0.05  # segundos
+
+os.environ.update({
+    "AZURE_CLIENT_ID": "bench",
+    "AZURE_TENANT_ID": "bench",
+    "AZURE_CLIENT_SECRET": "bench",
+    "AZURE_ORGANIZER_EMAIL": "agenda@example.com",
+    "AZURE_LOGIN_BASE": f"http://127.0.0.1:{PORTA}",
+    "GRAPH_API_BASE": f"http://127.0.0.1:{PORTA}",
+})
+
+from app.config import get_settings  # noqa: E402
+from app.services.graph_service import GraphService  # noqa: E402
+from benchmarks.fake_graph import FakeGraphServer  # noqa: E402
+
+settings = get_settings()
+
+
+async def token_sem_coalescencia(service: GraphService):
+    """Mesma lógica do _get_access_token anterior: uma busca por chamada."""
+    if service._access_token and time.time() < service._token_expires_at:
+        return service._access_token
+    response = await service.client.post(
+        f"{service.login_base}/{settings.azure_tenant_id}/oauth2/v2.0/token",
+        data={"grant_type": "client_credentials"}
+    )
+    token_data = response.json()
+    service._access_token = token_data["access_token"]
+    service._token_expires_at = time.time() + token_data["expires_in"] - 300
+    return service._access_token
+
+
+async def rodar(nome: str, servidor: FakeGraphServer, service: GraphService, obter_token, expirar: bool = True):
+    servidor.app.state.tokens_emitidos = 0
+    if expirar:
+        # Token expirado no início da rajada
+        service._token_expires_at = 0
+
+    latencias = []
+
+    async def chamada():
+        t0 = time.perf_counter()
+        await obter_token()
+        latencias.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(chamada() for _ in range(CHAMADAS)))
+    latencias.sort()
+    p99 = latencias[int(len(latencias) * 0.99)]
+    print(f"{nome:<22} | buscas de token {servidor.app.state.tokens_emitidos:>4} "
+          f"| espera média {sum(latencias) / len(latencias):>6.2f} ms | p99 {p99:>6.2f} ms")
+
+
+async def main():
+    with FakeGraphServer(PORTA, latencia=LATENCIA_TOKEN) as servidor:
+        service = GraphService()
+        await rodar("antes", servidor, service, lambda: token_sem_coalescencia(service))
+        await rodar("single-flight", servidor, service, service._get_access_token)
+
+        # Renovação proativa: o token é obtido no start() e renovado em segundo plano
+        service = GraphService()
+        await service.start()
+        while service._access_token is None:
+            await asyncio.sleep(0.01)
+        await rodar("renovação proativa", servidor, service, service._get_access_token, expirar=False)
+        print(f"Métricas: {service.metrics()}")
+        await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
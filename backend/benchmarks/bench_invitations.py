@@ -0,0 +1,113 @@
+"""Benchmark do envio de convites: um por participante x lote por reunião.
+
+Envia os convites de uma reunião com 200 participantes para um servidor SMTP
+local (aiosmtpd) e compara:
+
+- antes: uma chamada send_meeting_invitation por participante
+- depois: send_meeting_invitations (template renderizado uma vez, uma sessão)
+
+Mede conexões SMTP abertas, tempo total e tempo de CPU.
+
+Uso (a partir de backend/, requer `pip install aiosmtpd`):
+    python -m benchmarks.bench_invitations
+"""
+import asyncio
+import secrets
+import time
+from datetime import datetime
+from aiosmtpd.controller import Controller
+from app.services.email_service import EmailService
+from app.services.smtp_pool import SMTPPool
+
+HOST = "127.0.0.1"
+PORTA = 8026
+PARTICIPANTES = 200
+
+DADOS_REUNIAO = dict(
+    meeting_title="Planejamento trimestral",
+    meeting_id=1,
+    meeting_date=datetime(2026, 1, 5, 10, 0),
+    meeting_start="10:00",
+    meeting_end="11:00",
+    room_name="Showroom",
+    organizer_name="Ana",
+    organizer_email="ana@example.com",
+    description="Revisão de metas e orçamento",
+    teams_link="https://teams.example.com/l/meetup-join/abc"
+)
+
+
+class HandlerContador:
+    """Servidor SMTP de teste que conta sessões e mensagens."""
+
+    def __init__(self):
+        self.sessoes = 0
+        self.mensagens = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessoes += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.mensagens += 1
+        return "250 OK"
+
+
+def criar_servico() -> EmailService:
+    servico = EmailService()
+    servico.smtp_user = servico.smtp_password = "bench"
+    servico.from_email = "agenda@example.com"
+    # Sem pool de conexões: cada envio abre sua própria sessão, como antes
+    servico.pool = SMTPPool(HOST, PORTA, start_tls=False, size=4, keepalive_seconds=0)
+    return servico
+
+
+async def rodar(nome: str, handler: HandlerContador, enviar):
+    handler.sessoes = handler.mensagens = 0
+    participantes = [
+        {"email": f"p{i}@example.com", "name": f"Participante {i}", "token": secrets.token_urlsafe(32)}
+        for i in range(PARTICIPANTES)
+    ]
+
+    cpu = time.process_time()
+    inicio = time.perf_counter()
+    await enviar(participantes)
+    duracao = time.perf_counter() - inicio
+    cpu = time.process_time() - cpu
+
+    print(f"{nome:<34} | sessões {handler.sessoes:>4} | mensagens {handler.mensagens:>4} "
+          f"| tempo {duracao * 1000:>7.1f} ms | CPU {cpu * 1000:>7.1f} ms")
+
+
+async def main():
+    handler = HandlerContador()
+    controller = Controller(handler, hostname=HOST, port=PORTA)
+    controller.start()
+
+    try:
+        servico = criar_servico()
+
+        async def por_participante(participantes):
+            await asyncio.gather(*(
+                servico.send_meeting_invitation(
+                    to_email=p["email"],
+                    participant_name=p["name"],
+                    confirmation_token=p["token"],
+                    **DADOS_REUNIAO
+                )
+                for p in participantes
+            ))
+
+        async def em_lote(participantes):
+            await servico.send_meeting_invitations(attendees=participantes, **DADOS_REUNIAO)
+
+        await rodar("antes (um convite por tarefa)", handler, por_participante)
+        await rodar("depois (lote, uma sessão)", handler, em_lote)
+        await servico.close()
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
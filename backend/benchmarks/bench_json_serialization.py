@@ -0,0 +1,79 @@
+"""Microbenchmark da serialização de uma resposta grande do calendário.
+
+Serializa 50.000 eventos no formato de GET /api/meetings/calendar:
+
+- antes: dicts com `.isoformat()` -> jsonable_encoder -> JSONResponse (json)
+- depois: dicts com datetime nativo -> FastJSONResponse (orjson)
+
+Verifica que os bytes gerados são idênticos e mede o tempo (melhor de
+REPETICOES) e a vazão.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_json_serialization
+"""
+import time
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.services.json_response import FastJSONResponse
+
+TOTAL_EVENTOS = 50_000
+REPETICOES = 5
+INICIO = datetime(2026, 3, 1)
+
+
+def montar_eventos(iso: bool) -> list:
+    eventos = []
+    for i in range(TOTAL_EVENTOS):
+        inicio = INICIO + timedelta(minutes=(i * 37) % (30 * 24 * 60))
+        fim = inicio + timedelta(hours=1)
+        eventos.append({
+            "id": i + 1,
+            "title": f"Reunião {i}",
+            "start": inicio.isoformat() if iso else inicio,
+            "end": fim.isoformat() if iso else fim,
+            "room_id": i % 50 + 1,
+            "room_name": f"Sala {i % 50 + 1}",
+            "room_color": "#6366F1",
+            "organizer_name": f"Usuário {i % 500 + 1}",
+            "is_own_meeting": i % 500 == 0,
+            "teams_link": None
+        })
+    return eventos
+
+
+def medir(serializar) -> tuple:
+    melhor = float("inf")
+    corpo = b""
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        corpo = serializar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, corpo
+
+
+def main():
+    # Montagem dos dicts incluída: antes ela chamava .isoformat() por campo
+    antes, corpo_antes = medir(lambda: JSONResponse(jsonable_encoder(montar_eventos(iso=True))).body)
+    depois, corpo_depois = medir(lambda: FastJSONResponse(montar_eventos(iso=False)).body)
+    assert corpo_antes == corpo_depois, "saídas diferentes"
+
+    # Só a serialização, com os dicts já montados
+    eventos_iso = montar_eventos(iso=True)
+    eventos = montar_eventos(iso=False)
+    so_antes, _ = medir(lambda: JSONResponse(jsonable_encoder(eventos_iso)).body)
+    so_depois, _ = medir(lambda: FastJSONResponse(eventos).body)
+
+    tamanho = len(corpo_depois) / 1024 / 1024
+    print(f"{TOTAL_EVENTOS:,} eventos, {tamanho:.1f} MiB (saídas idênticas)")
+    for nome, duracao in (
+        ("antes (montar + encoder + json)", antes),
+        ("depois (montar + orjson)", depois),
+        ("antes (só serialização)", so_antes),
+        ("depois (só serialização)", so_depois),
+    ):
+        print(f"{nome:<32} | {duracao * 1000:>7.1f} ms | {tamanho / duracao:>7.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
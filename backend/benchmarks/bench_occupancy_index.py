@@ -0,0 +1,76 @@
+"""Benchmark de memória e latência do índice de ocupação em memória.
+
+Carrega 1.000.000 de reuniões distribuídas em 200 salas e mede o consumo de
+memória (tracemalloc) e a latência de verificações de conflito aleatórias.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_occupancy_index
+"""
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from app.services.occupancy_index import OccupancyIndex, _ts
+
+TOTAL_REUNIOES = 1_000_000
+TOTAL_SALAS = 200
+VERIFICACOES = 100_000
+BASE = datetime(2026, 1, 5, 8, 0)
+
+
+def montar_indice() -> OccupancyIndex:
+    """Preencher o índice com reuniões de 30 a 90 minutos, sem sobreposição por sala."""
+    indice = OccupancyIndex()
+    indice._horizonte = _ts(BASE)
+    por_sala = TOTAL_REUNIOES // TOTAL_SALAS
+    reuniao_id = 1
+
+    for sala_id in range(1, TOTAL_SALAS + 1):
+        inicio = _ts(BASE)
+        for _ in range(por_sala):
+            duracao = random.choice((1800, 3600, 5400))
+            indice._adicionar(indice._salas, sala_id, reuniao_id, inicio, inicio + duracao)
+            inicio += duracao + random.choice((0, 900, 1800))
+            reuniao_id += 1
+
+    return indice
+
+
+def main():
+    random.seed(42)
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    indice = montar_indice()
+    tempo_carga = time.perf_counter() - inicio
+    memoria_atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Reuniões no índice: {len(indice):,}")
+    print(f"Tempo de carga:     {tempo_carga:.2f} s")
+    print(f"Memória:            {memoria_atual / 1024 / 1024:.1f} MiB "
+          f"({memoria_atual / len(indice):.1f} bytes/reunião)")
+
+    # Verificações de 1h em horários aleatórios dentro do período carregado
+    dias = (TOTAL_REUNIOES // TOTAL_SALAS) * 5400 // 86400
+    latencias = []
+    conflitos = 0
+    for _ in range(VERIFICACOES):
+        sala_id = random.randint(1, TOTAL_SALAS)
+        start_dt = BASE + timedelta(minutes=random.randint(0, dias * 24 * 60))
+        end_dt = start_dt + timedelta(hours=1)
+        t0 = time.perf_counter_ns()
+        if indice.find_conflict(sala_id, start_dt, end_dt) is not None:
+            conflitos += 1
+        latencias.append(time.perf_counter_ns() - t0)
+
+    latencias.sort()
+    p50 = latencias[len(latencias) // 2] / 1000
+    p99 = latencias[int(len(latencias) * 0.99)] / 1000
+    print(f"Verificações:       {VERIFICACOES:,} ({conflitos:,} com conflito)")
+    print(f"Latência p50:       {p50:.1f} µs")
+    print(f"Latência p99:       {p99:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark de logins concorrentes: bcrypt no event loop x pool de threads.
+
+Dispara LOGINS logins simultâneos (usuários distintos, hash bcrypt) pelo app
+FastAPI (transporte ASGI) e mede logins por segundo e o atraso do event loop:
+
+- bcrypt no event loop: a KDF roda direto na corrotina (implementação ingênua)
+- bcrypt em pool: PasswordHasher com password_hash_workers threads
+
+Usa custo 10 por padrão para o benchmark terminar rápido (BENCH_ROUNDS).
+Com 1 CPU o throughput é parecido nos dois modos; a diferença está no lag,
+que no modo ingênuo trava todas as outras requisições.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_password_hashing
+"""
+import asyncio
+import os
+import time
+import httpx
+from app.config import get_settings
+from app.database import get_db, Usuario
+from app.main import app
+from app.services.password_hasher import PasswordHasher
+import app.routes.auth as rotas_auth
+from benchmarks.common import criar_engine_benchmark
+
+settings = get_settings()
+
+LOGINS = 200
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "10"))
+SENHA = "senha-benchmark"
+
+
+class HasherNoEventLoop(PasswordHasher):
+    """Executa a KDF na própria corrotina, bloqueando o event loop."""
+
+    async def _executar(self, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self.tempo_kdf += time.perf_counter() - inicio
+
+
+async def medir_lag(parar: asyncio.Event, amostras: list):
+    """Registrar o atraso do event loop em ciclos de 10 ms."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.01)
+        amostras.append(time.perf_counter() - inicio - 0.01)
+
+
+async def rodar(nome: str, client: httpx.AsyncClient, hasher: PasswordHasher):
+    rotas_auth.password_hasher = hasher
+    parar = asyncio.Event()
+    amostras = []
+    monitor = asyncio.create_task(medir_lag(parar, amostras))
+    await asyncio.sleep(0.02)
+
+    async def login(i: int):
+        response = await client.post("/api/auth/login", json={
+            "email": f"usuario{i}@example.com", "password": SENHA
+        })
+        assert response.status_code == 200, response.text
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(LOGINS)))
+    duracao = time.perf_counter() - inicio
+
+    parar.set()
+    await monitor
+    amostras.sort()
+    p99 = amostras[int(len(amostras) * 0.99)] * 1000 if amostras else 0
+    maximo = amostras[-1] * 1000 if amostras else 0
+    print(f"{nome:<28} | {LOGINS / duracao:>6.1f} logins/s | tempo {duracao:>5.2f} s "
+          f"| lag p99 {p99:>7.1f} ms | lag máx {maximo:>7.1f} ms")
+    hasher.close()
+
+
+async def main():
+    engine, session_factory = await criar_engine_benchmark()
+
+    async def _get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+
+    # Um hash por custo, compartilhado pelos usuários (mesma senha)
+    referencia = PasswordHasher(rounds=ROUNDS, workers=1)
+    senha_hash = await referencia.hash(SENHA)
+    referencia.close()
+    async with session_factory() as db:
+        db.add_all([
+            Usuario(email=f"usuario{i}@example.com", nome=f"Usuário {i}", senha_hash=senha_hash)
+            for i in range(LOGINS)
+        ])
+        await db.commit()
+
+    print(f"bcrypt custo {ROUNDS}, {LOGINS} logins concorrentes, {os.cpu_count()} CPU(s)")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await rodar("bcrypt no event loop", client, HasherNoEventLoop(rounds=ROUNDS))
+        await rodar(f"bcrypt em pool ({settings.password_hash_workers} threads)", client,
+                    PasswordHasher(rounds=ROUNDS, workers=settings.password_hash_workers))
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Benchmark de envio de e-mails: smtplib síncrono x pool assíncrono.
+
+Sobe um servidor SMTP local (aiosmtpd) com latência artificial e envia
+MENSAGENS e-mails concorrentes de duas formas:
+
+- antes: smtplib síncrono no event loop, uma conexão por mensagem
+- depois: SMTPPool (aiosmtplib) com conexões mantidas
+
+Mede mensagens por segundo e o atraso do event loop (lag) durante o envio.
+
+Uso (a partir de backend/, requer `pip install aiosmtpd`):
+    python -m benchmarks.bench_smtp
+"""
+import asyncio
+import smtplib
+import time
+from email.mime.text import MIMEText
+from aiosmtpd.controller import Controller
+from app.services.smtp_pool import SMTPPool
+
+HOST = "127.0.0.1"
+PORTA = 8025
+MENSAGENS = 200
+LATENCIA_SERVIDOR = 0.005  # segundos por comando DATA
+
+
+class HandlerLento:
+    """Servidor SMTP de teste que aceita tudo com um pequeno atraso."""
+
+    def __init__(self):
+        self.recebidas = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(LATENCIA_SERVIDOR)
+        self.recebidas += 1
+        return "250 OK"
+
+
+def criar_mensagem(i: int) -> MIMEText:
+    msg = MIMEText(f"<p>Mensagem {i}</p>", "html")
+    msg["Subject"] = f"Teste {i}"
+    msg["From"] = "bench@example.com"
+    msg["To"] = f"destino{i}@example.com"
+    return msg
+
+
+async def medir_lag(parar: asyncio.Event, amostras: list):
+    """Registrar o atraso do event loop em ciclos de 10 ms."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.01)
+        amostras.append(time.perf_counter() - inicio - 0.01)
+
+
+async def enviar_sincrono(msg: MIMEText):
+    """Comportamento anterior do EmailService.send_email."""
+    with smtplib.SMTP(HOST, PORTA) as server:
+        server.sendmail(msg["From"], msg["To"], msg.as_string())
+
+
+async def rodar(nome: str, enviar):
+    parar = asyncio.Event()
+    amostras = []
+    monitor = asyncio.create_task(medir_lag(parar, amostras))
+    await asyncio.sleep(0.02)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(enviar(criar_mensagem(i)) for i in range(MENSAGENS)))
+    duracao = time.perf_counter() - inicio
+
+    parar.set()
+    await monitor
+    amostras.sort()
+    lag_max = amostras[-1] * 1000 if amostras else 0
+    lag_p99 = amostras[int(len(amostras) * 0.99)] * 1000 if amostras else 0
+    print(f"{nome:<22} | {MENSAGENS / duracao:>8.1f} msg/s | lag p99 {lag_p99:>7.1f} ms | lag máx {lag_max:>7.1f} ms")
+
+
+async def main():
+    handler = HandlerLento()
+    controller = Controller(handler, hostname=HOST, port=PORTA)
+    controller.start()
+
+    try:
+        await rodar("antes (smtplib)", enviar_sincrono)
+
+        pool = SMTPPool(HOST, PORTA, start_tls=False, size=8)
+        await rodar("depois (pool, 8 conn)", lambda msg: pool.send(msg, sender=msg["From"]))
+        await pool.close()
+
+        print(f"Mensagens recebidas pelo servidor: {handler.recebidas}")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
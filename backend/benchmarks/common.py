@@ -0,0 +1,71 @@
+"""Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks usam por padrão um SQLite em memória (aiosqlite), para poderem
+rodar sem um MySQL local. Defina BENCH_DATABASE_URL para usar outro banco.
+"""
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.database import Base
+from app.services import room_catalog as catalogo_salas
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+
+async def criar_engine_benchmark():
+    """Criar engine e session factory com o schema completo."""
+    kwargs = {}
+    if BENCH_DATABASE_URL.startswith("sqlite"):
+        kwargs["poolclass"] = StaticPool
+    
+    engine = create_async_engine(BENCH_DATABASE_URL, **kwargs)
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine, session_factory
+
+
+async def usar_catalogo_de_salas(session_factory):
+    """Carregar o catálogo de salas do banco do benchmark (como o init_db faz).
+
+    Chamar depois de popular as salas.
+    """
+    catalogo_salas.AsyncSessionLocal = session_factory
+    await catalogo_salas.room_catalog.load()
+
+
+class ContadorQueries:
+    """Conta os statements SQL executados em um engine."""
+    
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.total = 0
+    
+    def _on_execute(self, *args, **kwargs):
+        self.total += 1
+    
+    @contextmanager
+    def medir(self):
+        self.total = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def cronometro():
+    """Mede o tempo decorrido (em ms) de um bloco."""
+    resultado = {"ms": 0.0}
+    inicio = time.perf_counter()
+    try:
+        yield resultado
+    finally:
+        resultado["ms"] = (time.perf_counter() - inicio) * 1000
@@ -0,0 +1,119 @@
+"""Servidor local que imita os endpoints do Microsoft Graph usados pelo sistema.
+
+Atende o token client_credentials, a criação e o cancelamento de eventos
+(individuais ou via JSON $batch).
+Usado pelos benchmarks do GraphService; roda em uma thread própria.
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+from typing import Optional, Tuple
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+HOST = "127.0.0.1"
+ASSUNTO_FALHA = "[falha]"
+
+
+def criar_app(latencia: float = 0.0) -> FastAPI:
+    """App FastAPI com os endpoints do Graph. `latencia` simula o tempo do servidor.
+
+    Eventos cujo assunto contém ASSUNTO_FALHA são recusados com 400, para
+    exercitar falhas por item. `app.state.requisicoes` conta as chamadas HTTP
+    recebidas (um $batch conta como uma).
+    """
+    app = FastAPI()
+    ids = itertools.count(1)
+    app.state.tokens_emitidos = 0
+    app.state.requisicoes = 0
+    app.state.eventos = set()
+
+    def criar(body: dict) -> Tuple[int, dict]:
+        if ASSUNTO_FALHA in (body or {}).get("subject", ""):
+            return 400, {"error": {"code": "ErrorInvalidRequest", "message": "Evento inválido"}}
+        event_id = f"evt-{next(ids)}"
+        app.state.eventos.add(event_id)
+        return 201, {"id": event_id, "onlineMeeting": {"joinUrl": f"https://teams.example.com/{event_id}"}}
+
+    def cancelar(event_id: str) -> Tuple[int, Optional[dict]]:
+        if event_id not in app.state.eventos:
+            return 404, {"error": {"code": "ErrorItemNotFound", "message": "Evento não encontrado"}}
+        app.state.eventos.discard(event_id)
+        return 204, None
+
+    @app.middleware("http")
+    async def contar(request: Request, call_next):
+        app.state.requisicoes += 1
+        return await call_next(request)
+
+    @app.post("/{tenant}/oauth2/v2.0/token")
+    async def token(tenant: str):
+        await asyncio.sleep(latencia)
+        app.state.tokens_emitidos += 1
+        return {"access_token": f"token-{app.state.tokens_emitidos}", "expires_in": 3600}
+
+    @app.post("/users/{user}/events", status_code=201)
+    async def criar_evento(user: str, request: Request):
+        await asyncio.sleep(latencia)
+        status, body = criar(await request.json())
+        return JSONResponse(body, status_code=status)
+
+    @app.delete("/users/{user}/events/{event_id}")
+    async def cancelar_evento(user: str, event_id: str):
+        await asyncio.sleep(latencia)
+        status, body = cancelar(event_id)
+        return Response(status_code=status) if body is None else JSONResponse(body, status_code=status)
+
+    @app.post("/$batch")
+    async def batch(request: Request):
+        await asyncio.sleep(latencia)
+        itens = (await request.json())["requests"]
+        if len(itens) > 20:
+            return JSONResponse({"error": {"code": "BadRequest"}}, status_code=400)
+
+        respostas = []
+        for item in itens:
+            partes = item["url"].strip("/").split("/")
+            if item["method"] == "POST" and partes[-1] == "events":
+                status, body = criar(item.get("body"))
+            elif item["method"] == "DELETE" and partes[-2] == "events":
+                status, body = cancelar(partes[-1])
+            else:
+                status, body = 400, {"error": {"code": "BadRequest"}}
+            resposta = {"id": item["id"], "status": status}
+            if body is not None:
+                resposta["body"] = body
+            respostas.append(resposta)
+
+        # O Graph não garante a ordem das respostas
+        random.shuffle(respostas)
+        return {"responses": respostas}
+
+    return app
+
+
+class FakeGraphServer:
+    """Executa o app em segundo plano (uvicorn em outra thread)."""
+
+    def __init__(self, port: int, latencia: float = 0.0):
+        self.port = port
+        self.app = criar_app(latencia)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=HOST, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{HOST}:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join()
@@ -54,3 +54,4 @@ print("   - Sala 04")
 print("   - Sala Conselho")
 print("   - Showroom")
 print("   - ShowroomSP")
+print("ℹ️ Com a API no ar, o catálogo de salas é atualizado na próxima conferência (ROOM_CATALOG_TTL_SECONDS)")
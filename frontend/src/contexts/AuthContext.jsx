@@ -30,6 +30,7 @@ export function AuthProvider({ children }) {
             // Save to localStorage
             localStorage.setItem('user', JSON.stringify(userData))
             localStorage.setItem('token', token)
+            localStorage.setItem('refreshToken', response.data.refresh_token)
 
             setUser(userData)
             setIsAuthenticated(true)
@@ -51,6 +52,7 @@ export function AuthProvider({ children }) {
             // Save to localStorage
             localStorage.setItem('user', JSON.stringify(userData))
             localStorage.setItem('token', token)
+            localStorage.setItem('refreshToken', response.data.refresh_token)
 
             setUser(userData)
             setIsAuthenticated(true)
@@ -63,8 +65,14 @@ export function AuthProvider({ children }) {
     }
 
     const logout = () => {
+        const refreshToken = localStorage.getItem('refreshToken')
+        if (refreshToken) {
+            // Revoke the session on the server (best effort)
+            api.post('/api/auth/logout', { refresh_token: refreshToken }).catch(() => {})
+        }
         localStorage.removeItem('user')
         localStorage.removeItem('token')
+        localStorage.removeItem('refreshToken')
         setUser(null)
         setIsAuthenticated(false)
     }
@@ -18,6 +18,24 @@ function CalendarPage() {
 
     useEffect(() => {
         loadData()
+
+        // Apply bookings made by other users without refetching the calendar
+        const unsubscribe = meetingService.subscribeCalendar(
+            startOfMonth(currentMonth),
+            endOfMonth(addMonths(currentMonth, 1)),
+            {
+                onCreated: (event) => setEvents((prev) =>
+                    prev.some((e) => e.id === event.id) ? prev : [...prev, event]
+                ),
+                onCancelled: ({ id }) => {
+                    setEvents((prev) => prev.filter((e) => e.id !== id))
+                    setSelectedEvent((prev) => (prev && prev.id === id ? null : prev))
+                },
+                // Events were missed: reload everything
+                onReset: () => loadData()
+            }
+        )
+        return unsubscribe
     }, [currentMonth])
 
     async function loadData() {
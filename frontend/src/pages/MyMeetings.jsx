@@ -19,6 +19,8 @@ function MyMeetings() {
     const location = useLocation()
     const [meetings, setMeetings] = useState([])
     const [loading, setLoading] = useState(true)
+    const [nextCursor, setNextCursor] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [filter, setFilter] = useState('upcoming') // 'upcoming', 'past', 'all'
     const [selectedMeeting, setSelectedMeeting] = useState(null)
     const [confirmDelete, setConfirmDelete] = useState(null)
@@ -27,7 +29,7 @@ function MyMeetings() {
 
     useEffect(() => {
         loadMeetings()
-    }, [])
+    }, [filter])
 
     useEffect(() => {
         if (successMessage) {
@@ -36,11 +38,20 @@ function MyMeetings() {
         }
     }, [successMessage])
 
+    // The date filter is applied by the API, one page at a time
+    function pageParams(after = null) {
+        const now = format(new Date(), "yyyy-MM-dd'T'HH:mm:ss")
+        if (filter === 'upcoming') return { startDate: now, after }
+        if (filter === 'past') return { endDate: now, after }
+        return { after }
+    }
+
     async function loadMeetings() {
         try {
             setLoading(true)
-            const meetingsData = await meetingService.getMeetings()
-            setMeetings(meetingsData)
+            const page = await meetingService.getInvitationsPage({ ...pageParams(), includeOrganized: true })
+            setMeetings(page.items)
+            setNextCursor(page.nextCursor)
         } catch (error) {
             console.error('Error loading meetings:', error)
         } finally {
@@ -48,6 +59,19 @@ function MyMeetings() {
         }
     }
 
+    async function loadMore() {
+        try {
+            setLoadingMore(true)
+            const page = await meetingService.getInvitationsPage({ ...pageParams(nextCursor), includeOrganized: true })
+            setMeetings(prev => [...prev, ...page.items])
+            setNextCursor(page.nextCursor)
+        } catch (error) {
+            console.error('Error loading meetings:', error)
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     const filteredMeetings = meetings.filter(meeting => {
         const meetingDate = new Date(meeting.start_datetime)
         const now = new Date()
@@ -112,7 +136,7 @@ function MyMeetings() {
                 <div>
                     <h1>Minhas Reuniões</h1>
                     <p style={{ color: 'var(--text-secondary)' }}>
-                        Gerencie suas reuniões agendadas
+                        Reuniões que você organiza e convites recebidos
                     </p>
                 </div>
 
@@ -182,7 +206,7 @@ function MyMeetings() {
                                                 color: 'var(--primary-600)'
                                             }}
                                         >
-                                            👤 Organizador
+                                            {meeting.role === 'attendee' ? '✉️ Convidado' : '👤 Organizador'}
                                         </span>
                                     </div>
 
@@ -204,20 +228,33 @@ function MyMeetings() {
                                     </div>
                                 </div>
 
-                                <button
-                                    onClick={(e) => {
-                                        e.stopPropagation()
-                                        setConfirmDelete(meeting)
-                                    }}
-                                    className="btn btn-ghost btn-icon"
-                                    title="Cancelar reunião"
-                                    style={{ color: 'var(--error)' }}
-                                >
-                                    <Trash2 size={18} />
-                                </button>
+                                {meeting.role === 'organizer' && (
+                                    <button
+                                        onClick={(e) => {
+                                            e.stopPropagation()
+                                            setConfirmDelete(meeting)
+                                        }}
+                                        className="btn btn-ghost btn-icon"
+                                        title="Cancelar reunião"
+                                        style={{ color: 'var(--error)' }}
+                                    >
+                                        <Trash2 size={18} />
+                                    </button>
+                                )}
                             </div>
                         </div>
                     ))}
+
+                    {nextCursor && (
+                        <button
+                            onClick={loadMore}
+                            className="btn btn-secondary"
+                            disabled={loadingMore}
+                            style={{ alignSelf: 'center' }}
+                        >
+                            {loadingMore ? 'Carregando...' : 'Carregar mais'}
+                        </button>
+                    )}
                 </div>
             )}
 
@@ -45,10 +45,10 @@ function Rooms() {
     async function loadAllSchedules() {
         setLoadingSchedules(true)
         try {
+            const schedule = await meetingService.getRoomsSchedule(selectedDate)
             const schedules = {}
-            for (const room of rooms) {
-                const schedule = await meetingService.getRoomSchedule(room.id, new Date(selectedDate))
-                schedules[room.id] = schedule.meetings
+            for (const room of schedule.rooms) {
+                schedules[room.room_id] = room.meetings
             }
             setRoomSchedules(schedules)
         } catch (error) {
@@ -22,13 +22,57 @@ api.interceptors.request.use(
     }
 )
 
+// Renew the access token with the refresh token (one request at a time)
+let refreshPromise = null
+
+function refreshAccessToken() {
+    if (!refreshPromise) {
+        const refreshToken = localStorage.getItem('refreshToken')
+        refreshPromise = (refreshToken
+            ? axios.post(`${apiConfig.baseUrl}/api/auth/refresh`, { refresh_token: refreshToken })
+            : Promise.reject(new Error('No refresh token'))
+        )
+            .then((response) => {
+                localStorage.setItem('token', response.data.access_token)
+                localStorage.setItem('refreshToken', response.data.refresh_token)
+                return response.data.access_token
+            })
+            .finally(() => {
+                refreshPromise = null
+            })
+    }
+    return refreshPromise
+}
+
+const AUTH_ENDPOINTS = ['/api/auth/login', '/api/auth/register', '/api/auth/refresh']
+
 // Response interceptor to handle errors
 api.interceptors.response.use(
     (response) => response,
-    (error) => {
+    async (error) => {
+        const original = error.config
+
+        if (
+            error.response?.status === 401 &&
+            original &&
+            !original._retry &&
+            !AUTH_ENDPOINTS.some((url) => original.url?.startsWith(url))
+        ) {
+            // Access token expired: renew it and retry the request once
+            original._retry = true
+            try {
+                const token = await refreshAccessToken()
+                original.headers.Authorization = `Bearer ${token}`
+                return api(original)
+            } catch {
+                // Refresh failed, fall through to logout
+            }
+        }
+
         if (error.response?.status === 401) {
             // Token expired or invalid
             localStorage.removeItem('token')
+            localStorage.removeItem('refreshToken')
             window.location.href = '/login'
         }
         return Promise.reject(error)
@@ -1,4 +1,19 @@
 import api from './api'
+import { apiConfig } from '../config/msalConfig'
+
+// Keyset-paginated listing: the next page cursor comes in the X-Next-Cursor header
+async function getPage(url, { startDate = null, endDate = null, after = null, limit = 50 } = {}, extra = {}) {
+    const params = { limit, ...extra }
+    if (startDate) params.start_date = startDate
+    if (endDate) params.end_date = endDate
+    if (after) params.after = after
+
+    const response = await api.get(url, { params })
+    return {
+        items: response.data,
+        nextCursor: response.headers['x-next-cursor'] || null
+    }
+}
 
 export const meetingService = {
     // Get all meetings for current user
@@ -11,6 +26,14 @@ export const meetingService = {
         return response.data
     },
 
+    // One page of meetings the user was invited to (status: pending | accepted | declined),
+    // optionally merged with the ones they organize; items carry role and my_status
+    async getInvitationsPage({ status = null, includeOrganized = false, ...options } = {}) {
+        const extra = { include_organized: includeOrganized }
+        if (status) extra.status = status
+        return getPage('/api/meetings/invitations', options, extra)
+    },
+
     // Get calendar events for a date range
     async getCalendarEvents(start, end) {
         // Usar formato ISO local se for Date, ou string direta
@@ -35,6 +58,14 @@ export const meetingService = {
         return response.data
     },
 
+    // Teams event status (created in background); wait > 0 long-polls until it is ready
+    async getTeamsStatus(id, wait = 0) {
+        const response = await api.get(`/api/meetings/${id}/teams`, {
+            params: { wait }
+        })
+        return response.data
+    },
+
     // Update a meeting
     async updateMeeting(id, meetingData) {
         const response = await api.put(`/api/meetings/${id}`, meetingData)
@@ -70,5 +101,75 @@ export const meetingService = {
             params: { date: dateStr }
         })
         return response.data
+    },
+
+    // Get the schedule of every active room for a day (single request)
+    async getRoomsSchedule(date) {
+        const dateStr = date instanceof Date ? date.toISOString() : date
+        const response = await api.get('/api/meetings/schedule', {
+            params: { date: dateStr }
+        })
+        return response.data
+    },
+
+    // Live calendar updates (Server-Sent Events); returns a function that closes the stream.
+    // handlers: { onCreated, onCancelled, onRsvp, onReset }
+    subscribeCalendar(start, end, handlers) {
+        let source = null
+        let retryTimer = null
+        let closed = false
+        let reconnecting = false
+
+        const reconnect = () => {
+            if (!closed) retryTimer = setTimeout(open, 3000)
+        }
+
+        const open = async () => {
+            let ticket
+            try {
+                // EventSource cannot send the Authorization header: it gets a short-lived,
+                // single-use ticket instead (requested through `api`, which refreshes the
+                // access token when it has expired)
+                ticket = (await api.post('/api/auth/stream-ticket')).data.ticket
+            } catch {
+                reconnect()
+                return
+            }
+            if (closed) return
+
+            const params = new URLSearchParams({
+                start: start instanceof Date ? start.toISOString() : start,
+                end: end instanceof Date ? end.toISOString() : end,
+                ticket
+            })
+            source = new EventSource(`${apiConfig.baseUrl}/api/meetings/stream?${params.toString()}`)
+            const listen = (type, handler) => {
+                if (handler) source.addEventListener(type, (e) => handler(JSON.parse(e.data)))
+            }
+
+            listen('meeting.created', handlers.onCreated)
+            listen('meeting.cancelled', handlers.onCancelled)
+            listen('meeting.rsvp', handlers.onRsvp)
+            listen('reset', handlers.onReset)
+            source.addEventListener('open', () => {
+                // Events may have been missed while disconnected: reload
+                if (reconnecting && handlers.onReset) handlers.onReset()
+                reconnecting = false
+            })
+            // The ticket cannot be reused, so the browser's own retry would fail:
+            // reopen with a new ticket instead
+            source.onerror = () => {
+                source.close()
+                reconnecting = true
+                reconnect()
+            }
+        }
+
+        open()
+        return () => {
+            closed = true
+            clearTimeout(retryTimer)
+            if (source) source.close()
+        }
     }
 }